@@ -1,8 +1,13 @@
 from fastapi import APIRouter
-from services.ai_core import make_ai_request
-from models.py_models import TextRequest
+from services.ai_core import make_ai_request, make_ai_batch_request
+from services.rate_limiter import RATE_LIMITER
+from services.response_cache import RESPONSE_CACHE
+from services.single_flight import SINGLE_FLIGHT
+from services.model_router import MODEL_ROUTER
+from services.structured_output import parse_stats
+from models.py_models import TextRequest, TextBatchRequest
 from models.ai_templates import (
-    SYSTEM_IDEOLOGICAL, SYSTEM_SENTIMENT,
+    SYSTEM_IDEOLOGICAL, SYSTEM_SENTIMENT, SYSTEM_ANALYSIS,
     CONTENT_TEMPLATE
 )
 
@@ -14,10 +19,51 @@ AI_ROUTER = APIRouter(prefix=f"/ai/{API_VERSION}", tags=["AI Requests"])
 @AI_ROUTER.post("/generate_ideology")
 async def generate_ideology(request: TextRequest):
     contents = CONTENT_TEMPLATE.format(text=request.text)
-    return await make_ai_request(SYSTEM_IDEOLOGICAL, contents)
+    return await make_ai_request(SYSTEM_IDEOLOGICAL, contents, request.priority)
 
 
 @AI_ROUTER.post("/generate_sentiment")
 async def generate_sentiment(request: TextRequest):
     contents = CONTENT_TEMPLATE.format(text=request.text)
-    return await make_ai_request(SYSTEM_SENTIMENT, contents)
\ No newline at end of file
+    return await make_ai_request(SYSTEM_SENTIMENT, contents, request.priority)
+
+
+# Ideologies and sentiments in a single LLM round trip
+@AI_ROUTER.post("/generate_analysis")
+async def generate_analysis(request: TextRequest):
+    contents = CONTENT_TEMPLATE.format(text=request.text)
+    return await make_ai_request(SYSTEM_ANALYSIS, contents, request.priority)
+
+
+# Batch endpoints: results in request order, with per-item errors
+@AI_ROUTER.post("/batch/generate_ideology")
+async def generate_ideology_batch(request: TextBatchRequest):
+    contents_list = [CONTENT_TEMPLATE.format(text=text) for text in request.texts]
+    return await make_ai_batch_request(SYSTEM_IDEOLOGICAL, contents_list, request.priority)
+
+
+@AI_ROUTER.post("/batch/generate_sentiment")
+async def generate_sentiment_batch(request: TextBatchRequest):
+    contents_list = [CONTENT_TEMPLATE.format(text=text) for text in request.texts]
+    return await make_ai_batch_request(SYSTEM_SENTIMENT, contents_list, request.priority)
+
+
+@AI_ROUTER.post("/batch/generate_analysis")
+async def generate_analysis_batch(request: TextBatchRequest):
+    contents_list = [CONTENT_TEMPLATE.format(text=text) for text in request.texts]
+    return await make_ai_batch_request(SYSTEM_ANALYSIS, contents_list, request.priority)
+
+
+@AI_ROUTER.get("/status")
+async def get_status():
+    return {
+        "rate_limiter": RATE_LIMITER.status(),
+        "cache": RESPONSE_CACHE.stats(),
+        "coalescing": SINGLE_FLIGHT.stats(),
+        "parsing": parse_stats(),
+    }
+
+
+@AI_ROUTER.get("/models")
+async def get_models():
+    return {"models": MODEL_ROUTER.stats()}
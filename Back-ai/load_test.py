@@ -0,0 +1,124 @@
+"""
+Load test for the AI service endpoints, with no network by default.
+
+In-process mode (default) drives the FastAPI app through httpx.ASGITransport with the mock
+provider, the rate limiter opened and unique texts so the response cache never hits:
+
+    python3 load_test.py --requests 500 --concurrency 50
+    python3 load_test.py --latency-ms 800 --error-rate 0.05
+    python3 load_test.py --texts 20 --priority low  # Repeated texts are coalesced while in flight
+
+Set --url to load test a running service instead (its own AI_PROVIDER is used):
+
+    python3 load_test.py --url http://localhost:9000 --requests 100 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import httpx
+
+ENDPOINTS = ("/generate_ideology", "/generate_sentiment")
+SAMPLE_TEXT = (
+    "The government announced a new economic policy to support small businesses affected by "
+    "the rise of energy prices, while the opposition criticised the measures as insufficient."
+)
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_load_test(
+    client: httpx.AsyncClient, total: int, concurrency: int, texts: int, priority: str
+) -> dict:
+    """Send total requests alternating the endpoints over texts distinct texts, at most concurrency at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = {endpoint: [] for endpoint in ENDPOINTS}
+    failures = {endpoint: 0 for endpoint in ENDPOINTS}
+
+    async def send(i: int) -> None:
+        endpoint = ENDPOINTS[i % len(ENDPOINTS)]
+        # Unique text per request unless texts is set, the response cache answers repeated ones
+        payload = {"text": f"{SAMPLE_TEXT} Request {i % texts if texts else i}.", "priority": priority}
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(f"/ai/v1{endpoint}", json=payload)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            elapsed = time.perf_counter() - start
+        latencies[endpoint].append(elapsed)
+        if not ok:
+            failures[endpoint] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(i) for i in range(total)))
+    duration = time.perf_counter() - start
+    return {"latencies": latencies, "failures": failures, "duration": duration}
+
+
+def print_report(results: dict) -> None:
+    duration = results["duration"]
+    all_latencies = [latency for values in results["latencies"].values() for latency in values]
+    rows = [*((endpoint, results["latencies"][endpoint], results["failures"][endpoint]) for endpoint in ENDPOINTS)]
+    rows.append(("total", all_latencies, sum(results["failures"].values())))
+
+    print(f"{'endpoint':<22}{'requests':>9}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for name, latencies, failures in rows:
+        if not latencies:
+            continue
+        print(
+            f"{name:<22}{len(latencies):>9}{failures:>8}"
+            f"{percentile(latencies, 50) * 1000:>10.1f}"
+            f"{percentile(latencies, 95) * 1000:>10.1f}"
+            f"{percentile(latencies, 99) * 1000:>10.1f}"
+            f"{len(latencies) / duration:>10.1f}"
+        )
+    print(f"Duration: {duration:.2f}s")
+
+
+async def main(args) -> None:
+    timeout = httpx.Timeout(args.timeout)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+            results = await run_load_test(client, args.requests, args.concurrency, args.texts, args.priority)
+            status = (await client.get("/ai/v1/status")).json()
+    else:
+        # Configure the service before importing it: mock provider, no quota, no Redis
+        os.environ["AI_PROVIDER"] = "mock"
+        os.environ["AI_MOCK_LATENCY_MS"] = str(args.latency_ms)
+        os.environ["AI_MOCK_JITTER_MS"] = str(args.jitter_ms)
+        os.environ["AI_MOCK_ERROR_RATE"] = str(args.error_rate)
+        os.environ.setdefault("AI_REQUESTS_PER_MINUTE", "1000000")
+        os.environ.setdefault("AI_TOKENS_PER_MINUTE", "1000000000")
+        os.environ["AI_CACHE_REDIS_URL"] = ""
+        from main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://back-ai", timeout=timeout) as client:
+            results = await run_load_test(client, args.requests, args.concurrency, args.texts, args.priority)
+            status = (await client.get("/ai/v1/status")).json()
+
+    print_report(results)
+    print(f"Coalescing: {status.get('coalescing')}")
+    print(f"Queue: {status['rate_limiter'].get('queue')}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Medianalytics AI service load test")
+    parser.add_argument("--url", default="", help="Base URL of a running service, in-process with the mock provider if empty")
+    parser.add_argument("--requests", type=int, default=200, help="Total number of requests")
+    parser.add_argument("--concurrency", type=int, default=20, help="Maximum concurrent requests")
+    parser.add_argument("--texts", type=int, default=0, help="Distinct texts, 0 for a unique text per request")
+    parser.add_argument("--priority", default="normal", choices=("high", "normal", "low"), help="Request priority")
+    parser.add_argument("--timeout", type=float, default=120, help="Request timeout in seconds")
+    parser.add_argument("--latency-ms", type=float, default=300, help="Mock provider latency")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="Mock provider latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0, help="Mock provider error rate")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,75 @@
+"""
+Agreement benchmark of the local zero-shot classifier against the labels stored by the LLM.
+
+Export the stored labels as JSONL from the database (one article per line):
+
+    psql "$DATABASE_URL" -At -c "SELECT json_build_object('text', title || '. ' || article,
+        'ideologies', ideologies, 'sentiments', sentiments) FROM article ORDER BY id DESC LIMIT 500" > labels.jsonl
+
+Then run it where requirements-local.txt is installed (back-ai built with LOCAL_CLASSIFIER=true):
+
+    python3 local_benchmark.py labels.jsonl
+    python3 local_benchmark.py labels.jsonl --limit 100 --batch-size 16 --model MoritzLaurer/deberta-v3-base-zeroshot-v2.0
+
+Stored articles are the cleaned texts (stop words removed), agreement on the raw texts may be higher.
+"""
+
+import argparse
+import json
+import time
+from services.local_classifier import ZeroShotClassifier, NUM_LABELS
+from utils.config import AI_LOCAL_MODEL, AI_LOCAL_BATCH_SIZE
+
+FIELDS = ("ideologies", "sentiments")
+
+
+def load_labels(path: str, limit: int) -> list[dict]:
+    with open(path, encoding="utf-8") as read_file:
+        rows = [json.loads(line) for line in read_file if line.strip()]
+    return rows[:limit] if limit else rows
+
+
+def agreement(predicted: list[list[str]], stored: list[list[str]]) -> dict:
+    """Mean share of the stored labels found in the top predictions, and rates of any and full matches."""
+    overlaps = [
+        len(set(prediction) & set(labels)) / min(NUM_LABELS, len(labels))
+        for prediction, labels in zip(predicted, stored)
+        if labels
+    ]
+    return {
+        "overlap": sum(overlaps) / len(overlaps) if overlaps else 0.0,
+        "any_match": sum(1 for overlap in overlaps if overlap > 0) / len(overlaps) if overlaps else 0.0,
+        "full_match": sum(1 for overlap in overlaps if overlap == 1) / len(overlaps) if overlaps else 0.0,
+    }
+
+
+def main(args) -> None:
+    rows = load_labels(args.labels, args.limit)
+    classifier = ZeroShotClassifier(args.model, args.batch_size)
+    classifier.load()
+    texts = [row["text"] for row in rows]
+    print(f"{len(texts)} articles, model {args.model}")
+
+    for field in FIELDS:
+        start = time.perf_counter()
+        predicted = []
+        for i in range(0, len(texts), args.batch_size):
+            predicted.extend(classifier.classify(texts[i:i + args.batch_size], field))
+        elapsed = time.perf_counter() - start
+
+        # Predictions are in the LLM answer format, ideologies with hyphens
+        predicted = [[value.replace("-", "_") for value in values] for values in predicted]
+        scores = agreement(predicted, [row[field] or [] for row in rows])
+        print(
+            f"{field:<11} overlap {scores['overlap'] * 100:5.1f}%  any {scores['any_match'] * 100:5.1f}%  "
+            f"full {scores['full_match'] * 100:5.1f}%  {len(texts) / elapsed:6.2f} articles/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local classifier agreement with the stored LLM labels")
+    parser.add_argument("labels", help="JSONL file with text, ideologies and sentiments per line")
+    parser.add_argument("--limit", type=int, default=0, help="Maximum number of articles, 0 for all")
+    parser.add_argument("--model", default=AI_LOCAL_MODEL, help="Hugging Face NLI model")
+    parser.add_argument("--batch-size", type=int, default=AI_LOCAL_BATCH_SIZE, help="Texts per batch")
+    main(parser.parse_args())
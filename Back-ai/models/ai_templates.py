@@ -27,4 +27,26 @@ Rules:
 5. Output only valid JSON, no additional text.
 """
 
-CONTENT_TEMPLATE: Final = "Text to analyze: '{text}'."
\ No newline at end of file
+SYSTEM_ANALYSIS: Final = f"""You are an expert analyst specialized in identifying ideologies and sentiments in text.
+Your task is to carefully analyze and understand a given text and identify exactly 3 distinct ideologies and exactly 3 distinct sentiments from the valid lists.
+
+Valid ideologies: {IDEOLOGIES}.
+
+Valid sentiments: {SENTIMENTS}.
+
+Rules:
+1. Ensure you carefully analyze and understand the text and the lists of valid ideologies and sentiments.
+2. Select exactly 3 different ideologies and exactly 3 different sentiments that best describe the text.
+3. Each ideology and sentiment must exist in its valid list, in uppercase format.
+4. Respond with exactly one JSON object: {{"ideologies": ["IDEOLOGY_1", "IDEOLOGY_2", "IDEOLOGY_3"], "sentiments": ["SENTIMENT_1", "SENTIMENT_2", "SENTIMENT_3"]}}
+5. Output only valid JSON, no additional text.
+"""
+
+CONTENT_TEMPLATE: Final = "Text to analyze: '{text}'."
+
+# Fields of the JSON answer requested by each system instruction
+RESPONSE_FIELDS: Final = {
+    SYSTEM_IDEOLOGICAL: ("ideologies",),
+    SYSTEM_SENTIMENT: ("sentiments",),
+    SYSTEM_ANALYSIS: ("ideologies", "sentiments"),
+}
@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from enum import Enum
+from pydantic import BaseModel, Field
 from config.sentiments_ideologies_enums import SentimentsEnum, IdeologiesEnum
 
 
@@ -6,8 +7,27 @@ SENTIMENTS = ", ".join(sentiment.value for sentiment in SentimentsEnum)
 IDEOLOGIES = ", ".join(ideology.value.replace("_", "-") for ideology in IdeologiesEnum)
 
 
+MAX_BATCH_SIZE = 50
+
+
+# Requests waiting for the provider quota are served by priority, then in arrival order
+class PriorityEnum(str, Enum):
+    HIGH = "high"  # Interactive requests and retries
+    NORMAL = "normal"
+    LOW = "low"  # Bulk backfills
+
+
+PRIORITY_RANKS = {PriorityEnum.HIGH: 0, PriorityEnum.NORMAL: 1, PriorityEnum.LOW: 2}
+
+
 class TextRequest(BaseModel):
     text: str
+    priority: PriorityEnum = PriorityEnum.NORMAL
+
+
+class TextBatchRequest(BaseModel):
+    texts: list[str] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+    priority: PriorityEnum = PriorityEnum.NORMAL
 
 
 # Define the Pydantic model for schema validation
@@ -17,4 +37,22 @@ class ResponseSchema(BaseModel):
 
 
 class ResponseAI(BaseModel):
-    response: list[IdeologiesEnum] | list[SentimentsEnum]
\ No newline at end of file
+    response: list[IdeologiesEnum] | list[SentimentsEnum]
+
+
+class AnalysisSchema(BaseModel):
+    ideologies: list[IdeologiesEnum]
+    sentiments: list[SentimentsEnum]
+
+
+class ResponseAnalysisAI(BaseModel):
+    response: AnalysisSchema
+
+
+class BatchItemAI(BaseModel):
+    response: list[IdeologiesEnum] | list[SentimentsEnum] | AnalysisSchema | None = None
+    error: str | None = None
+
+
+class ResponseBatchAI(BaseModel):
+    response: list[BatchItemAI]
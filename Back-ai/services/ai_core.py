@@ -1,73 +1,178 @@
 import asyncio
+import time
 import traceback
-import json, re
+from contextlib import nullcontext
 from fastapi import HTTPException
-from utils.config import API_KEY
-from google import genai
-from google.genai import types
-from models.py_models import ResponseSchema, ResponseAI
+from utils.config import AI_STRUCTURED_OUTPUT
+from models.ai_templates import RESPONSE_FIELDS
+from services.providers import PROVIDER, FALLBACK_PROVIDER
+from services.model_router import MODEL_ROUTER
+from services.rate_limiter import RATE_LIMITER, estimate_tokens
+from services.response_cache import RESPONSE_CACHE
+from services.single_flight import SINGLE_FLIGHT
+from services.structured_output import (
+    build_response_schema, extract_json, validate_answer, record_parse
+)
+from models.py_models import (
+    ResponseSchema, ResponseAI, ResponseAnalysisAI, AnalysisSchema,
+    BatchItemAI, ResponseBatchAI, PriorityEnum, PRIORITY_RANKS
+)
 
 
-# Initialize client
-client = genai.Client(api_key=API_KEY)
+MAX_OUTPUT_TOKENS = 256
+
+# Enum-constrained JSON schemas of the answers, built once
+RESPONSE_SCHEMAS = {fields: build_response_schema(fields) for fields in RESPONSE_FIELDS.values()}
+
+
+def to_response(parsed: dict) -> ResponseAI | ResponseAnalysisAI | None:
+    """Validate a parsed JSON answer against ResponseSchema and wrap it in the response model."""
+    validated = ResponseSchema(**parsed)
+
+    if validated.ideologies is not None and validated.sentiments is not None:
+        return ResponseAnalysisAI(
+            response=AnalysisSchema(
+                ideologies=validated.ideologies,
+                sentiments=validated.sentiments,
+            )
+        )
+
+    if validated.ideologies is not None:
+        return ResponseAI(response=validated.ideologies)
+
+    if validated.sentiments is not None:
+        return ResponseAI(response=validated.sentiments)
+
+    return None
 
 
 async def make_ai_request(
     system_instruction: str,
     contents: str,
+    priority: PriorityEnum = PriorityEnum.NORMAL,
     max_retries: int = 2
-) -> ResponseAI | None:
-    """Make a request to the AI provider using Google GenAI SDK."""
+) -> ResponseAI | ResponseAnalysisAI | None:
+    """Make a request to the configured AI provider (AI_PROVIDER), coalescing identical in-flight ones."""
 
     print("System Instruction:", system_instruction)
     print("Contents:", contents)
-    for attempt in range(1, max_retries + 1):
-        try:
-            # Add a 10 second delay before making the request to avoid rate limiting per minute
-            await asyncio.sleep(10)
-
-            response = await client.aio.models.generate_content(
-                # model="gemma-4-31b-it",
-                model="gemma-4-26b-a4b-it",
-                contents=contents,
-                config=types.GenerateContentConfig(
-                    system_instruction=system_instruction,
-                    temperature=0.3,
-                    top_p=0.9,
-                    max_output_tokens=256,
-                    thinking_config=types.ThinkingConfig(thinking_level="MINIMAL")
-                ),
-            )
-            print(f"Attempt {attempt}:", response)
 
-            raw = response.text
+    # Answers of any candidate model are valid, the key changes with the candidates
+    models = MODEL_ROUTER.name if PROVIDER.routes_models else PROVIDER.name
+    cache_key = RESPONSE_CACHE.make_key(models, system_instruction, contents)
+    cached = await RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        print("Cache hit:", cache_key)
+        return to_response(cached)
 
-            # Try to extract the first JSON object from the response
-            json_match = re.search(r"\{[^{}]*\}", raw, flags=re.DOTALL)
-            if json_match:
-                clean = json_match.group(0)
-            else:
-                clean = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw.strip(), flags=re.IGNORECASE).strip()
+    return await SINGLE_FLIGHT.run(
+        cache_key,
+        lambda: request_provider(system_instruction, contents, cache_key, priority, max_retries),
+    )
 
-            parsed = json.loads(clean)
 
-            if "ideologies" in parsed:
-                parsed["ideologies"] = [ideology.replace("-", "_") for ideology in parsed["ideologies"]]
+async def request_provider(
+    system_instruction: str,
+    contents: str,
+    cache_key: str,
+    priority: PriorityEnum,
+    max_retries: int
+) -> ResponseAI | ResponseAnalysisAI | None:
+    """Request the provider within the rate limiter budget and cache the validated answer."""
 
-            validated = ResponseSchema(**parsed)
+    fields = RESPONSE_FIELDS[system_instruction]
+    response_schema = RESPONSE_SCHEMAS[fields] if AI_STRUCTURED_OUTPUT else None
 
-            if validated.ideologies is not None:
-                return ResponseAI(response=validated.ideologies)
+    failed_models = set()
+    for attempt in range(1, max_retries + 1):
+        model = None
+        try:
+            # Wait for the provider quota instead of a fixed delay, retries jump ahead of the queue
+            if PROVIDER.uses_quota:
+                await RATE_LIMITER.acquire(
+                    estimate_tokens(system_instruction, contents, max_output_tokens=MAX_OUTPUT_TOKENS),
+                    rank=PRIORITY_RANKS[priority if attempt == 1 else PriorityEnum.HIGH],
+                )
+
+            # Fastest healthy model, another one on retries. Other providers answer with their own model
+            model = MODEL_ROUTER.choose(exclude=failed_models) if PROVIDER.routes_models else PROVIDER.name
+            start = time.perf_counter()
+            structured = response_schema is not None and PROVIDER.supports_structured_output(model)
+            with MODEL_ROUTER.track(model) if PROVIDER.routes_models else nullcontext():
+                raw = await PROVIDER.generate(
+                    model, system_instruction, contents, MAX_OUTPUT_TOKENS,
+                    response_schema if structured else None,
+                )
+            latency = time.perf_counter() - start
+            print(f"Attempt {attempt} ({model}):", raw)
+            RATE_LIMITER.report_success()
+
+            # Fallback may have happened during the call
+            structured = structured and PROVIDER.supports_structured_output(model)
+            try:
+                parsed = validate_answer(extract_json(raw, structured), fields)
+            except ValueError as e:  # json.JSONDecodeError included
+                record_parse(model, ok=False)
+                raise ValueError(f"Unparsable answer: {e}") from e
+            record_parse(model, ok=True)
+            if PROVIDER.routes_models:
+                MODEL_ROUTER.record(model, latency, ok=True)
 
-            if validated.sentiments is not None:
-                return ResponseAI(response=validated.sentiments)
+            result = to_response(parsed)
+            if result is not None:
+                await RESPONSE_CACHE.set(cache_key, parsed)
+                return result
 
         except Exception as e:
+            if model is not None and PROVIDER.routes_models:
+                MODEL_ROUTER.record(model, time.perf_counter() - start, ok=False)
+                failed_models.add(model)
+            if PROVIDER.is_rate_limited(e):
+                RATE_LIMITER.report_rate_limited()
             print(f"Error on attempt {attempt}: {e}")
             traceback.print_exc()
+            if attempt == max_retries and FALLBACK_PROVIDER is not None:
+                return await request_fallback(system_instruction, contents, fields)
             if attempt == max_retries:
                 raise HTTPException(
                     status_code=500,
                     detail=f"AI service error after {max_retries} attempts: {e}"
                 )
     return None
+
+
+async def request_fallback(
+    system_instruction: str,
+    contents: str,
+    fields: tuple[str, ...]
+) -> ResponseAI | ResponseAnalysisAI | None:
+    """Answer with the local classifier after the provider failed, not cached to retry the provider later."""
+    try:
+        raw = await FALLBACK_PROVIDER.generate(FALLBACK_PROVIDER.name, system_instruction, contents, MAX_OUTPUT_TOKENS)
+        print("Fallback answer:", raw)
+        return to_response(validate_answer(extract_json(raw, structured=True), fields))
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"AI service and local fallback error: {e}")
+
+
+async def make_ai_batch_request(
+    system_instruction: str,
+    contents_list: list[str],
+    priority: PriorityEnum = PriorityEnum.NORMAL,
+) -> ResponseBatchAI:
+    """Run the requests of a batch concurrently within the rate limiter budget, keeping their order."""
+
+    async def run_item(contents: str) -> BatchItemAI:
+        try:
+            result = await make_ai_request(system_instruction, contents, priority)
+            if result is None:
+                return BatchItemAI(error="Empty AI response")
+            return BatchItemAI(response=result.response)
+        except HTTPException as e:
+            return BatchItemAI(error=str(e.detail))
+        except Exception as e:
+            return BatchItemAI(error=str(e))
+
+    results = await asyncio.gather(*(run_item(contents) for contents in contents_list))
+    return ResponseBatchAI(response=list(results))
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from config.sentiments_ideologies_enums import SentimentsEnum, IdeologiesEnum
+from services.providers import AIProvider, requested_fields
+from utils.config import AI_LOCAL_MODEL, AI_LOCAL_BATCH_SIZE, AI_LOCAL_BATCH_WAIT_MS
+
+NUM_LABELS = 3  # Top labels returned per field, as the LLM prompts request
+
+# Natural language label given to the NLI model -> value in the format of the LLM answers
+LABELS = {
+    "ideologies": {
+        ideology.value.replace("_", " ").lower(): ideology.value.replace("_", "-") for ideology in IdeologiesEnum
+    },
+    "sentiments": {
+        sentiment.value.replace("_", " ").lower(): sentiment.value for sentiment in SentimentsEnum
+    },
+}
+
+HYPOTHESIS_TEMPLATES = {
+    "ideologies": "The ideology of this text is {}.",
+    "sentiments": "The sentiment of this text is {}.",
+}
+
+CONTENT_RE = re.compile(r"^Text to analyze: '(.*)'\.$", flags=re.DOTALL)
+
+
+def extract_text(contents: str) -> str:
+    """The article text of the contents built with CONTENT_TEMPLATE."""
+    match = CONTENT_RE.match(contents)
+    return match.group(1) if match else contents
+
+
+class ZeroShotClassifier:
+    """
+    NLI zero-shot classifier on CPU over the sentiment and ideology label sets.
+    Each label is scored independently (multi-label), the NLI model runs on text-label pairs
+    in batches of batch_size.
+    """
+
+    def __init__(self, model_name: str = AI_LOCAL_MODEL, batch_size: int = AI_LOCAL_BATCH_SIZE):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._pipeline = None
+
+    def load(self) -> None:
+        if self._pipeline is None:
+            from transformers import pipeline
+            self._pipeline = pipeline("zero-shot-classification", model=self.model_name, device="cpu")
+
+    def classify(self, texts: list[str], field: str) -> list[list[str]]:
+        """Top NUM_LABELS values of the field for each text."""
+        self.load()
+        labels = LABELS[field]
+        results = self._pipeline(
+            texts,
+            candidate_labels=list(labels),
+            hypothesis_template=HYPOTHESIS_TEMPLATES[field],
+            multi_label=True,
+            batch_size=self.batch_size,
+        )
+        if isinstance(results, dict):  # Single text
+            results = [results]
+        return [[labels[label] for label in result["labels"][:NUM_LABELS]] for result in results]
+
+
+class LocalClassifierProvider(AIProvider):
+    """
+    Provider answering with the local zero-shot classifier, no network and no quota.
+    Concurrent requests are grouped by field in batches of AI_LOCAL_BATCH_SIZE texts, or what
+    arrived within AI_LOCAL_BATCH_WAIT_MS, and classified in a single worker thread.
+    """
+
+    name = "local"
+    uses_quota = False
+
+    def __init__(
+        self,
+        classifier: ZeroShotClassifier | None = None,
+        batch_size: int = AI_LOCAL_BATCH_SIZE,
+        batch_wait_ms: float = AI_LOCAL_BATCH_WAIT_MS,
+    ):
+        self.classifier = classifier or ZeroShotClassifier()
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-classifier")
+        self._pending: dict[str, list[tuple[str, asyncio.Future]]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def classify(self, text: str, field: str) -> list[str]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(field, [])
+        pending.append((text, future))
+        if len(pending) >= self.batch_size:
+            self._flush(field)
+        elif field not in self._timers:
+            self._timers[field] = loop.call_later(self.batch_wait, self._flush, field)
+        return await future
+
+    def _flush(self, field: str) -> None:
+        timer = self._timers.pop(field, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(field, [])
+        if batch:
+            task = asyncio.create_task(self._run_batch(field, batch))
+            self._tasks.add(task)  # Keep a reference until done
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, field: str, batch: list[tuple[str, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        texts = [text for text, _ in batch]
+        try:
+            results = await loop.run_in_executor(self._executor, self.classifier.classify, texts, field)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), labels in zip(batch, results):
+            if not future.done():
+                future.set_result(labels)
+
+    async def generate(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: str,
+        max_output_tokens: int,
+        response_schema: dict | None = None,
+    ) -> str:
+        text = extract_text(contents)
+        fields = sorted(requested_fields(system_instruction, response_schema))
+        values = await asyncio.gather(*(self.classify(text, field) for field in fields))
+        return json.dumps(dict(zip(fields, values)))
@@ -0,0 +1,147 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+from utils.config import (
+    AI_MODELS, AI_ROUTER_WINDOW,
+    AI_ROUTER_MAX_ERROR_RATE, AI_ROUTER_COOLDOWN
+)
+
+MIN_SAMPLES = 5  # Calls in the window before the error rate can mark a model unhealthy
+MAX_CONSECUTIVE_ERRORS = 3
+
+
+def parse_models(value: str) -> list[tuple[str, float]]:
+    """Parse "name:weight,name" into (name, weight) pairs, weight 1 by default."""
+    models = []
+    for item in value.split(","):
+        name, _, weight = item.strip().partition(":")
+        if name:
+            models.append((name, float(weight) if weight else 1.0))
+    if not models:
+        raise ValueError("AI_MODELS must name at least one model")
+    return models
+
+
+class ModelStats:
+    """Moving window of the recent calls of a model: (latency in seconds, success)."""
+
+    def __init__(self, name: str, weight: float, window: int):
+        self.name = name
+        self.weight = weight
+        self.calls: deque[tuple[float, bool]] = deque(maxlen=window)
+        self.consecutive_errors = 0
+        self.in_flight = 0
+        self.down_until = 0.0
+        self.total_calls = 0
+        self.total_errors = 0
+
+    @property
+    def mean_latency(self) -> float | None:
+        latencies = [latency for latency, ok in self.calls if ok]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    @property
+    def error_rate(self) -> float:
+        return sum(1 for _, ok in self.calls if not ok) / len(self.calls) if self.calls else 0.0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.down_until
+
+    def score(self, prior_latency: float) -> float:
+        """
+        Weighted latency scaled by the calls in flight, lower is better.
+        Models without samples are assumed as fast as prior_latency, so they get tried.
+        """
+        latency = self.mean_latency
+        if latency is None:
+            latency = prior_latency
+        return latency * (1 + self.in_flight) / self.weight
+
+
+class ModelRouter:
+    """
+    Routes the requests to the fastest healthy model, by moving-window latency divided by weight
+    and scaled by the calls in flight.
+    A model with too many errors in its window, or MAX_CONSECUTIVE_ERRORS in a row, is skipped
+    for a cooldown and then tried again with a fresh window.
+    """
+
+    def __init__(self, models: list[tuple[str, float]], window: int, max_error_rate: float, cooldown: float):
+        self.models = {name: ModelStats(name, weight, window) for name, weight in models}
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+
+    @property
+    def name(self) -> str:
+        """Identifier of the candidate models, e.g. for cache keys."""
+        return ",".join(self.models)
+
+    def choose(self, exclude: set[str] = frozenset()) -> str:
+        """The best healthy model not excluded, else the one recovering first."""
+        now = time.monotonic()
+        candidates = [stats for name, stats in self.models.items() if name not in exclude]
+        if not candidates:  # Every model failed this request, start over
+            candidates = list(self.models.values())
+
+        healthy = [stats for stats in candidates if stats.healthy(now)]
+        if healthy:
+            latencies = [stats.mean_latency for stats in healthy if stats.mean_latency is not None]
+            prior_latency = min(latencies, default=1.0)
+            return min(healthy, key=lambda stats: stats.score(prior_latency)).name
+        return min(candidates, key=lambda stats: stats.down_until).name
+
+    @contextmanager
+    def track(self, model: str):
+        """Count a call in flight to the model, so bursts spread over the candidates."""
+        stats = self.models[model]
+        stats.in_flight += 1
+        try:
+            yield
+        finally:
+            stats.in_flight -= 1
+
+    def record(self, model: str, latency: float, ok: bool) -> None:
+        stats = self.models[model]
+        now = time.monotonic()
+        if stats.down_until and now >= stats.down_until:
+            # Back from the cooldown, judged on the new calls only
+            stats.calls.clear()
+            stats.down_until = 0.0
+
+        stats.calls.append((latency, ok))
+        stats.total_calls += 1
+        if ok:
+            stats.consecutive_errors = 0
+            return
+
+        stats.total_errors += 1
+        stats.consecutive_errors += 1
+        if not stats.healthy(now):  # Calls started before the model was marked unhealthy
+            return
+        too_many_errors = len(stats.calls) >= MIN_SAMPLES and stats.error_rate >= self.max_error_rate
+        if stats.consecutive_errors >= MAX_CONSECUTIVE_ERRORS or too_many_errors:
+            stats.down_until = now + self.cooldown
+            stats.consecutive_errors = 0
+            print(f"Model {model} unhealthy, skipped for {self.cooldown}s")
+
+    def stats(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "model": stats.name,
+                "weight": stats.weight,
+                "healthy": stats.healthy(now),
+                "cooldown_seconds": round(max(0.0, stats.down_until - now), 2),
+                "in_flight": stats.in_flight,
+                "window_calls": len(stats.calls),
+                "mean_latency_ms": round(stats.mean_latency * 1000, 1) if stats.mean_latency is not None else None,
+                "error_rate": round(stats.error_rate * 100, 2),
+                "total_calls": stats.total_calls,
+                "total_errors": stats.total_errors,
+            }
+            for stats in self.models.values()
+        ]
+
+
+# Shared router for all the requests to the provider
+MODEL_ROUTER = ModelRouter(parse_models(AI_MODELS), AI_ROUTER_WINDOW, AI_ROUTER_MAX_ERROR_RATE, AI_ROUTER_COOLDOWN)
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import random
+from abc import ABC, abstractmethod
+from utils.config import (
+    API_KEY, AI_PROVIDER, AI_LOCAL_FALLBACK,
+    AI_MOCK_LATENCY_MS, AI_MOCK_JITTER_MS,
+    AI_MOCK_ERROR_RATE, AI_MOCK_RATE_LIMIT_RATE
+)
+from config.sentiments_ideologies_enums import SentimentsEnum, IdeologiesEnum
+
+# Parameters named by the 400 errors of models without JSON mode (underscores removed, lower case)
+JSON_MODE_ERROR_KEYS = ("responseschema", "responsejsonschema", "responsemimetype", "json mode")
+
+
+def requested_fields(system_instruction: str, response_schema: dict | None) -> set[str]:
+    """Fields of the JSON answer requested by the schema, or else by the prompt."""
+    if response_schema:
+        return set(response_schema["properties"])
+    return {field for field in ("ideologies", "sentiments") if f'"{field}"' in system_instruction}
+
+
+class AIProvider(ABC):
+    """Interface of the LLM providers: raw text answer of a system instruction and contents."""
+
+    name = "base"
+    uses_quota = True  # Requests wait for the rate limiter budget
+    routes_models = False  # The model router picks one of the AI_MODELS candidates per request
+
+    @abstractmethod
+    async def generate(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: str,
+        max_output_tokens: int,
+        response_schema: dict | None = None,
+    ) -> str:
+        """Raw answer, constrained to the JSON schema if given and supported by the model."""
+
+    def supports_structured_output(self, model: str) -> bool:
+        return True
+
+    def is_rate_limited(self, error: Exception) -> bool:
+        """Whether the error means the provider quota is exhausted (HTTP 429)."""
+        return False
+
+
+class GenAIProvider(AIProvider):
+    """Google GenAI provider, the client is created on the first request."""
+
+    name = "genai"
+    routes_models = True
+
+    def __init__(self, api_key: str | None):
+        self.api_key = api_key
+        self._client = None
+        self._no_json_mode: set[str] = set()  # Models rejecting a response schema
+
+    @property
+    def client(self):
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client(api_key=self.api_key)
+        return self._client
+
+    def supports_structured_output(self, model: str) -> bool:
+        return model not in self._no_json_mode
+
+    async def generate(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: str,
+        max_output_tokens: int,
+        response_schema: dict | None = None,
+    ) -> str:
+        from google.genai import types, errors
+        structured = response_schema is not None and self.supports_structured_output(model)
+        config = types.GenerateContentConfig(
+            system_instruction=system_instruction,
+            temperature=0.3,
+            top_p=0.9,
+            max_output_tokens=max_output_tokens,
+            thinking_config=types.ThinkingConfig(thinking_level="MINIMAL"),
+            response_mime_type="application/json" if structured else None,
+            response_json_schema=response_schema if structured else None,
+        )
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=model, contents=contents, config=config
+            )
+        except errors.ClientError as e:
+            if not structured or not self.rejects_response_schema(e):
+                raise
+            # The model has no JSON mode: free text answers from now on
+            print(f"Structured output not supported by {model}, falling back to free text: {e}")
+            self._no_json_mode.add(model)
+            return await self.generate(model, system_instruction, contents, max_output_tokens)
+        return response.text
+
+    @staticmethod
+    def rejects_response_schema(error: Exception) -> bool:
+        """
+        Whether a 400 says the model does not support the JSON mode, not any other bad request
+        (API key, contents, generation config) that must not disable it for the process.
+        """
+        if getattr(error, "code", None) != 400:
+            return False
+        message = str(error).lower().replace("_", "")
+        return any(key in message for key in JSON_MODE_ERROR_KEYS)
+
+    def is_rate_limited(self, error: Exception) -> bool:
+        from google.genai import errors
+        return isinstance(error, errors.APIError) and error.code == 429
+
+
+class MockProviderError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class MockProvider(AIProvider):
+    """
+    Local provider for tests and load tests, no network.
+    Answers after latency_ms ± jitter_ms with 3 random valid enum values per requested field,
+    fails with a 500 at error_rate and a 429 at rate_limit_rate.
+    """
+
+    name = "mock"
+
+    def __init__(
+        self,
+        latency_ms: float = AI_MOCK_LATENCY_MS,
+        jitter_ms: float = AI_MOCK_JITTER_MS,
+        error_rate: float = AI_MOCK_ERROR_RATE,
+        rate_limit_rate: float = AI_MOCK_RATE_LIMIT_RATE,
+        seed: int | None = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    async def generate(
+        self,
+        model: str,
+        system_instruction: str,
+        contents: str,
+        max_output_tokens: int,
+        response_schema: dict | None = None,
+    ) -> str:
+        self.calls += 1
+        latency = self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)
+        await asyncio.sleep(max(0.0, latency) / 1000)
+
+        draw = self.random.random()
+        if draw < self.rate_limit_rate:
+            raise MockProviderError(429, "Mock quota exhausted")
+        if draw < self.rate_limit_rate + self.error_rate:
+            raise MockProviderError(500, "Mock provider error")
+
+        fields = requested_fields(system_instruction, response_schema)
+        answer = {}
+        if "ideologies" in fields:
+            ideologies = self.random.sample(list(IdeologiesEnum), 3)
+            answer["ideologies"] = [ideology.value.replace("_", "-") for ideology in ideologies]
+        if "sentiments" in fields:
+            answer["sentiments"] = [sentiment.value for sentiment in self.random.sample(list(SentimentsEnum), 3)]
+        if response_schema:
+            return json.dumps(answer)
+        return f"```json\n{json.dumps(answer)}\n```"  # Free text answers come wrapped like the real models
+
+    def is_rate_limited(self, error: Exception) -> bool:
+        return isinstance(error, MockProviderError) and error.code == 429
+
+
+def local_provider() -> AIProvider:
+    # Imported on demand, transformers and torch come from requirements-local.txt
+    from services.local_classifier import LocalClassifierProvider
+    return LocalClassifierProvider()
+
+
+PROVIDERS = {
+    "genai": lambda: GenAIProvider(API_KEY),
+    "mock": MockProvider,
+    "local": local_provider,
+}
+
+
+def get_provider(name: str = AI_PROVIDER) -> AIProvider:
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown AI_PROVIDER '{name}', expected one of {list(PROVIDERS)}")
+    print(f"Using AI provider: {name}")
+    return PROVIDERS[name]()
+
+
+# Shared provider for all the requests
+PROVIDER = get_provider()
+
+# Local classifier answering when the provider still fails after the retries
+FALLBACK_PROVIDER = get_provider("local") if AI_LOCAL_FALLBACK and AI_PROVIDER != "local" else None
@@ -0,0 +1,173 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from models.py_models import PRIORITY_RANKS
+from utils.config import (
+    AI_REQUESTS_PER_MINUTE, AI_TOKENS_PER_MINUTE,
+    AI_BACKOFF_INITIAL, AI_BACKOFF_MAX
+)
+
+
+class TokenBucket:
+    """Bucket refilled continuously up to its capacity over one minute."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.refill_rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until the bucket holds the given amount."""
+        missing = min(amount, self.capacity) - self.available
+        return max(0.0, missing / self.refill_rate)
+
+    def consume(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+
+class Waiter:
+    """A call waiting for the budget, ordered by priority rank then arrival."""
+
+    def __init__(self, rank: int, sequence: int):
+        self.rank = rank
+        self.sequence = sequence
+        self.enqueued = time.monotonic()
+        self.wake_up = asyncio.Event()
+
+    def __lt__(self, other: "Waiter") -> bool:
+        return (self.rank, self.sequence) < (other.rank, other.sequence)
+
+
+class RateLimiter:
+    """
+    Async rate limiter for the LLM provider quota, in requests and tokens per minute.
+    Calls are admitted as fast as both budgets allow, the rest wait in a priority queue
+    (lower rank first, then arrival order). After a 429 from the provider every call waits
+    an exponential backoff.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.backoff = 0.0
+        self.backoff_until = 0.0
+        self.admitted = 0
+        self.rate_limited = 0
+        self._queue: list[Waiter] = []
+        self._sequence = itertools.count()
+        self._wait_times: deque[float] = deque(maxlen=1000)  # Recent queue waits in seconds
+        self._max_wait = 0.0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._queue)
+
+    def _wake_head(self) -> None:
+        if self._queue:
+            self._queue[0].wake_up.set()
+
+    async def acquire(self, tokens: int, rank: int = 1) -> None:
+        """
+        Wait until one request and the estimated tokens fit in the budget, then consume them.
+        Only the head of the queue waits on the budget, the others wait for their turn.
+        Args:
+            tokens (int): Estimated tokens of the request.
+            rank (int): Priority rank, lower ranks are admitted first.
+        """
+        waiter = Waiter(rank, next(self._sequence))
+        heapq.heappush(self._queue, waiter)
+        try:
+            while True:
+                if self._queue[0] is not waiter:
+                    await waiter.wake_up.wait()
+                    waiter.wake_up.clear()
+                    continue
+
+                now = time.monotonic()
+                self.requests.refill(now)
+                self.tokens.refill(now)
+                wait = max(
+                    self.backoff_until - now,
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens),
+                )
+                if wait <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(tokens)
+                    self.admitted += 1
+                    waited = now - waiter.enqueued
+                    self._wait_times.append(waited)
+                    self._max_wait = max(self._max_wait, waited)
+                    return
+                try:
+                    # Woken up early if a higher priority call becomes the head
+                    await asyncio.wait_for(waiter.wake_up.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                waiter.wake_up.clear()
+        finally:
+            head = self._queue[0] is waiter
+            self._queue.remove(waiter)
+            heapq.heapify(self._queue)
+            if head:
+                self._wake_head()
+
+    def report_rate_limited(self, retry_after: float | None = None) -> None:
+        """Back off after a 429 from the provider, doubling the delay on consecutive ones."""
+        self.rate_limited += 1
+        self.backoff = min(AI_BACKOFF_MAX, self.backoff * 2 if self.backoff else AI_BACKOFF_INITIAL)
+        delay = max(self.backoff, retry_after or 0.0)
+        self.backoff_until = max(self.backoff_until, time.monotonic() + delay)
+        # The provider quota is exhausted, drain the local budget as well
+        self.requests.available = 0.0
+        self.tokens.available = 0.0
+
+    def report_success(self) -> None:
+        self.backoff = 0.0
+
+    def status(self) -> dict:
+        now = time.monotonic()
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        return {
+            "requests_per_minute": int(self.requests.capacity),
+            "tokens_per_minute": int(self.tokens.capacity),
+            "requests_available": round(self.requests.available, 2),
+            "tokens_available": int(self.tokens.available),
+            "backoff_seconds": round(max(0.0, self.backoff_until - now), 2),
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "queue": self.queue_status(now),
+        }
+
+    def queue_status(self, now: float) -> dict:
+        """Queue depth by priority and wait times in seconds of the recent admitted calls."""
+        names = {rank: priority.value for priority, rank in PRIORITY_RANKS.items()}
+        depth = {name: 0 for name in names.values()}
+        for waiter in self._queue:
+            depth[names[waiter.rank]] += 1
+        waits = sorted(self._wait_times)
+        return {
+            "depth": depth,
+            "oldest_wait_seconds": round(max((now - waiter.enqueued for waiter in self._queue), default=0.0), 2),
+            "wait_p50_seconds": round(waits[len(waits) // 2], 3) if waits else 0.0,
+            "wait_p95_seconds": round(waits[int(len(waits) * 0.95)], 3) if waits else 0.0,
+            "wait_max_seconds": round(self._max_wait, 3),
+        }
+
+
+def estimate_tokens(*texts: str, max_output_tokens: int = 0) -> int:
+    """Rough token count of a request: ~4 characters per token plus the output budget."""
+    return sum(len(text) for text in texts) // 4 + max_output_tokens
+
+
+# Shared limiter for all the requests to the provider
+RATE_LIMITER = RateLimiter(AI_REQUESTS_PER_MINUTE, AI_TOKENS_PER_MINUTE)
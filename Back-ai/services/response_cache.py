@@ -0,0 +1,90 @@
+import hashlib
+import json
+import time
+import logging
+from collections import OrderedDict
+from utils.config import AI_CACHE_TTL, AI_CACHE_MAX_ENTRIES, AI_CACHE_REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Cache of validated AI responses keyed by hash(model, system_instruction, contents).
+    In-memory LRU bounded by max_entries with a TTL, optionally backed by Redis so entries
+    survive restarts. Redis errors are counted and fall back to the provider.
+    """
+
+    def __init__(self, ttl: int, max_entries: int, redis_url: str = ""):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._redis = None
+        if redis_url:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(redis_url, decode_responses=True)
+            except ImportError:
+                logger.warning("redis package not installed, AI response cache runs in memory only")
+        self._stats = {"hits": 0, "redis_hits": 0, "misses": 0, "errors": 0}
+
+    @staticmethod
+    def make_key(model: str, system_instruction: str, contents: str) -> str:
+        digest = hashlib.sha256("\x00".join((model, system_instruction, contents)).encode()).hexdigest()
+        return f"cache:ai:{digest}"
+
+    def _set_local(self, key: str, value: dict) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return value
+            del self._entries[key]
+
+        if self._redis is not None:
+            try:
+                cached = await self._redis.get(key)
+                if cached:
+                    value = json.loads(cached)
+                    self._set_local(key, value)
+                    self._stats["hits"] += 1
+                    self._stats["redis_hits"] += 1
+                    return value
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Redis error on GET {key}: {e}")
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: dict) -> None:
+        self._set_local(key, value)
+        if self._redis is not None:
+            try:
+                await self._redis.setex(key, self.ttl, json.dumps(value))
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Redis error on SET {key}: {e}")
+
+    def stats(self) -> dict:
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "redis": self._redis is not None,
+            "hit_rate": round(self._stats["hits"] / total * 100, 2) if total else 0.0,
+        }
+
+
+# Shared cache for all the requests to the provider
+RESPONSE_CACHE = ResponseCache(AI_CACHE_TTL, AI_CACHE_MAX_ENTRIES, AI_CACHE_REDIS_URL)
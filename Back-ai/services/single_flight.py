@@ -0,0 +1,58 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls: the first caller of a key runs the call,
+    the callers arriving while it runs await its result (or its exception).
+    """
+
+    def __init__(self):
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                # Shield: a cancelled follower must not cancel the call of the others
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.run(key, call)  # The leader was cancelled, not this caller
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.leaders += 1
+        try:
+            result = await call()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved, followers may not exist
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def stats(self) -> dict:
+        total = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / total * 100, 2) if total else 0.0,
+        }
+
+
+# Shared coalescer for all the requests to the provider
+SINGLE_FLIGHT = SingleFlight()
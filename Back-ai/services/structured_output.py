@@ -0,0 +1,85 @@
+import json
+import re
+from collections import defaultdict
+from config.sentiments_ideologies_enums import SentimentsEnum, IdeologiesEnum
+
+NUM_VALUES = 3  # Values requested per field by the prompts
+
+# Valid values in the format given to the model (ideologies with hyphens, as in the prompts)
+FIELD_VALUES = {
+    "ideologies": tuple(ideology.value.replace("_", "-") for ideology in IdeologiesEnum),
+    "sentiments": tuple(sentiment.value for sentiment in SentimentsEnum),
+}
+
+# Precomputed sets to validate the answers before building the pydantic models
+VALID_VALUES = {
+    "ideologies": frozenset(ideology.value for ideology in IdeologiesEnum),
+    "sentiments": frozenset(sentiment.value for sentiment in SentimentsEnum),
+}
+
+JSON_OBJECT_RE = re.compile(r"\{[^{}]*\}", flags=re.DOTALL)
+CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", flags=re.IGNORECASE)
+
+# Parse results per model: answers validated at once and parse or validation failures
+PARSE_STATS: dict[str, dict[str, int]] = defaultdict(lambda: {"ok": 0, "failures": 0})
+
+
+def build_response_schema(fields: tuple[str, ...]) -> dict:
+    """JSON schema of an answer: for each field an array of exactly NUM_VALUES enum strings."""
+    return {
+        "type": "object",
+        "properties": {
+            field: {
+                "type": "array",
+                "items": {"type": "string", "enum": list(FIELD_VALUES[field])},
+                "minItems": NUM_VALUES,
+                "maxItems": NUM_VALUES,
+            }
+            for field in fields
+        },
+        "required": list(fields),
+    }
+
+
+def extract_json(raw: str, structured: bool) -> dict:
+    """Decode the answer: as is in structured mode, else the first JSON object of the free text."""
+    if structured:
+        return json.loads(raw)
+    json_match = JSON_OBJECT_RE.search(raw)
+    if json_match:
+        return json.loads(json_match.group(0))
+    return json.loads(CODE_FENCE_RE.sub("", raw.strip()).strip())
+
+
+def validate_answer(parsed: dict, fields: tuple[str, ...]) -> dict:
+    """
+    Check that each field holds at least NUM_VALUES distinct valid values.
+    Returns the first NUM_VALUES enum values of each field (hyphens replaced), raises ValueError otherwise.
+    """
+    if not isinstance(parsed, dict):
+        raise ValueError(f"Answer is not a JSON object: {parsed}")
+    answer = {}
+    for field in fields:
+        values = parsed.get(field)
+        if not isinstance(values, list):
+            raise ValueError(f"Missing {field} in answer: {parsed}")
+        # Distinct values in answer order, extra ones of free text answers are dropped
+        values = list(dict.fromkeys(str(value).strip().upper().replace("-", "_") for value in values))
+        if len(values) < NUM_VALUES or not VALID_VALUES[field].issuperset(values):
+            raise ValueError(f"Invalid {field} in answer: {values}")
+        answer[field] = values[:NUM_VALUES]
+    return answer
+
+
+def record_parse(model: str, ok: bool) -> None:
+    PARSE_STATS[model]["ok" if ok else "failures"] += 1
+
+
+def parse_stats() -> dict:
+    return {
+        model: {
+            **stats,
+            "failure_rate": round(stats["failures"] / (stats["ok"] + stats["failures"]) * 100, 2),
+        }
+        for model, stats in PARSE_STATS.items()
+    }
@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from google.genai import errors
+from services.providers import AIProvider, GenAIProvider
+
+MODEL = "gemma-4-26b-a4b-it"
+SCHEMA = {"type": "object", "properties": {"sentiments": {"type": "array"}}, "required": ["sentiments"]}
+
+
+class FakeModels:
+    """generate_content failing with the given errors first, then answering."""
+
+    def __init__(self, *failures: Exception):
+        self.failures = list(failures)
+        self.configs = []
+
+    async def generate_content(self, model, contents, config):
+        self.configs.append(config)
+        if self.failures:
+            raise self.failures.pop(0)
+        return SimpleNamespace(text='{"sentiments": ["HAPPY", "SAD", "ANGRY"]}')
+
+
+def make_provider(*failures: Exception) -> tuple[GenAIProvider, FakeModels]:
+    provider = GenAIProvider(api_key="test")
+    models = FakeModels(*failures)
+    provider._client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    return provider, models
+
+
+def client_error(message: str) -> errors.ClientError:
+    return errors.ClientError(400, {"error": {"code": 400, "message": message, "status": "INVALID_ARGUMENT"}})
+
+
+class GenAIProviderJsonModeTest(unittest.TestCase):
+
+    def generate(self, provider: GenAIProvider) -> str:
+        return asyncio.run(provider.generate(MODEL, "instruction", "contents", 256, response_schema=SCHEMA))
+
+    def test_generic_bad_request_keeps_json_mode(self):
+        provider, models = make_provider(client_error("API key not valid. Please pass a valid API key."))
+        with self.assertRaises(errors.ClientError):
+            self.generate(provider)
+        self.assertTrue(provider.supports_structured_output(MODEL))
+        self.assertEqual(len(models.configs), 1)
+
+    def test_unsupported_schema_falls_back_to_free_text(self):
+        provider, models = make_provider(client_error("response_schema is not supported for this model."))
+        self.assertIn("HAPPY", self.generate(provider))
+        self.assertFalse(provider.supports_structured_output(MODEL))
+        self.assertEqual(models.configs[1].response_mime_type, None)
+
+
+class AIProviderInterfaceTest(unittest.TestCase):
+
+    def test_provider_without_generate_is_rejected(self):
+        class IncompleteProvider(AIProvider):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            IncompleteProvider()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,41 @@
 import os
 
 API_KEY = os.getenv("API_KEY")
+
+# Provider quota, adjust to the model plan
+AI_REQUESTS_PER_MINUTE = int(os.getenv("AI_REQUESTS_PER_MINUTE", "30"))
+AI_TOKENS_PER_MINUTE = int(os.getenv("AI_TOKENS_PER_MINUTE", "15000"))
+
+# Backoff in seconds after the provider answers 429 (doubled on consecutive ones)
+AI_BACKOFF_INITIAL = float(os.getenv("AI_BACKOFF_INITIAL", "5"))
+AI_BACKOFF_MAX = float(os.getenv("AI_BACKOFF_MAX", "120"))
+
+# Response cache, set AI_CACHE_REDIS_URL (e.g. redis://redis:6379/1) to back it with Redis
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", "604800"))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "2000"))
+AI_CACHE_REDIS_URL = os.getenv("AI_CACHE_REDIS_URL", "")
+
+# LLM provider: "genai" (Google GenAI) or "mock" (local, no network, for load tests)
+AI_PROVIDER = os.getenv("AI_PROVIDER", "genai").lower()
+
+# Mock provider behaviour
+AI_MOCK_LATENCY_MS = float(os.getenv("AI_MOCK_LATENCY_MS", "300"))
+AI_MOCK_JITTER_MS = float(os.getenv("AI_MOCK_JITTER_MS", "100"))
+AI_MOCK_ERROR_RATE = float(os.getenv("AI_MOCK_ERROR_RATE", "0"))
+AI_MOCK_RATE_LIMIT_RATE = float(os.getenv("AI_MOCK_RATE_LIMIT_RATE", "0"))
+
+# Structured output: the provider constrains the answer to a JSON schema of the valid enum values.
+# Models without JSON mode fall back to free text automatically.
+AI_STRUCTURED_OUTPUT = os.getenv("AI_STRUCTURED_OUTPUT", "true").lower() == "true"
+
+# Candidate models of the GenAI provider as "name:weight,..." the router prefers the fastest healthy one (latency / weight)
+AI_MODELS = os.getenv("AI_MODELS", "gemma-4-26b-a4b-it")
+AI_ROUTER_WINDOW = int(os.getenv("AI_ROUTER_WINDOW", "50"))  # Recent calls tracked per model
+AI_ROUTER_MAX_ERROR_RATE = float(os.getenv("AI_ROUTER_MAX_ERROR_RATE", "0.5"))
+AI_ROUTER_COOLDOWN = float(os.getenv("AI_ROUTER_COOLDOWN", "60"))  # Seconds an unhealthy model is skipped
+
+# Local zero-shot classifier (AI_PROVIDER=local, or fallback), needs requirements-local.txt
+AI_LOCAL_MODEL = os.getenv("AI_LOCAL_MODEL", "MoritzLaurer/deberta-v3-xsmall-zeroshot-v1.1-all-33")
+AI_LOCAL_BATCH_SIZE = int(os.getenv("AI_LOCAL_BATCH_SIZE", "8"))  # Texts classified together
+AI_LOCAL_BATCH_WAIT_MS = float(os.getenv("AI_LOCAL_BATCH_WAIT_MS", "20"))  # Wait to fill a batch
+AI_LOCAL_FALLBACK = os.getenv("AI_LOCAL_FALLBACK", "false").lower() == "true"
@@ -13,6 +13,7 @@ from pydantic import ValidationError
 from services.filters import get_sentiments_ideologies_categorized
 from utils.limiter import LIMITER
 from utils.redis_cache import init_redis_pool, close_redis_pool, get_cache_stats
+from repository.database import get_pool_stats
 from controllers.home import HOME_ROUTER
 from controllers.filters import FILTERS_ROUTER
 from middleware.security import SecurityMiddleware, RequestLoggingMiddleware
@@ -146,5 +147,6 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "back-api",
-        "cache": cache_stats
+        "cache": cache_stats,
+        "database_pool": get_pool_stats()
     }
@@ -3,17 +3,73 @@ This module sets up the database connection and session management.
 """
 
 import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 
 # Database connection URL
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Connection pool and connection settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds waiting for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds before a connection is replaced, -1 never
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # 0 for no limit
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100"))  # 0 behind PgBouncer
+
+# Pool checkout statistics, waits of the recent checkouts in seconds
+_pool_stats = {
+    "checkouts": 0,
+    "timeouts": 0,
+    "total_wait": 0.0,
+    "max_wait": 0.0,
+}
+_recent_waits: deque[float] = deque(maxlen=1000)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool recording how long each checkout waits for a connection (pre-ping included),
+    so pool exhaustion shows up in the health endpoint before requests time out.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            _pool_stats["timeouts"] += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            _pool_stats["checkouts"] += 1
+            _pool_stats["total_wait"] += wait
+            _pool_stats["max_wait"] = max(_pool_stats["max_wait"], wait)
+            _recent_waits.append(wait)
+
 
 # Create the SQLAlchemy async engine
-engine = create_async_engine(DATABASE_URL)
+engine = create_async_engine(
+    DATABASE_URL,
+    poolclass=TimedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args={
+        "server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)},
+        "prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE,
+    },
+)
 
 
 # Create a SessionLocal class to manage sessions
@@ -32,3 +88,36 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """
     async with SessionLocal() as session:
         yield session
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provides a session in a transaction, committed on exit and rolled back on error.
+    """
+    async with SessionLocal() as session:
+        async with session.begin():
+            yield session
+
+
+def get_pool_stats() -> dict:
+    """
+    Get the connection pool usage and the checkout waits since the service started.
+    Returns:
+        dict: Pool size, connections checked out and in, overflow, checkouts, timeouts and waits in ms.
+    """
+    pool = engine.pool
+    waits = sorted(_recent_waits)
+    checkouts = _pool_stats["checkouts"]
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),  # Negative while the pool is not full
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checkouts": checkouts,
+        "timeouts": _pool_stats["timeouts"],
+        "wait_ms_mean": round(_pool_stats["total_wait"] / checkouts * 1000, 2) if checkouts else 0.0,
+        "wait_ms_p95": round(waits[int(len(waits) * 0.95)] * 1000, 2) if waits else 0.0,
+        "wait_ms_max": round(_pool_stats["max_wait"] * 1000, 2),
+    }
@@ -1,11 +1,17 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from services.main_service import main_service_main
+from services.ai_queue import run_ai_queue_consumer
+from services.warm_up import warm_up, warm_up_word_cache
+from utils.http_client import init_http_client, close_http_client
+from repository.database import get_pool_stats
+from repository.word_cache import WORD_CACHE
 
 
 # Configure logging at the application entry point.
@@ -19,12 +25,23 @@ logger = logging.getLogger(__name__)
 # Instantiate AsyncIOScheduler (ideal for async tasks)
 scheduler = AsyncIOScheduler()
 
+# Background task loading the models and the word ID cache at startup
+warm_up_task: asyncio.Task | None = None
+
+# Background task consuming the AI analysis queue
+ai_queue_task: asyncio.Task | None = None
+
 
 # --- APScheduler Task ---
 async def scheduled_task():
     """Run the async main() method from main_service.py inside the event loop."""
     logger.info("🚀 Starting scheduled task: running main_service.main()")
     try:
+        if warm_up_task is not None and not warm_up_task.done():
+            logger.info("⏳ Waiting for the warm-up to finish before scraping")
+            await warm_up_task
+        # Reload the most frequent words, the counts changed since startup or the last job
+        await warm_up_word_cache()
         await main_service_main()
         logger.info("✅ Scheduled task completed successfully")
     except Exception as e:
@@ -34,8 +51,11 @@ async def scheduled_task():
 # Define lifespan to manage startup and shutdown events
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    global warm_up_task, ai_queue_task
     # Schedule the task (adjust hour and minute to your intended schedule)
     try:
+        await init_http_client()  # Shared pooled HTTP client for inter-service calls
+
         if not scheduler.running:  # Prevent double-starting APScheduler
             # Schedule daily task
             scheduler.add_job(
@@ -47,11 +67,27 @@ async def lifespan(_: FastAPI):
             
             scheduler.start()
             logger.info("📅 APScheduler started: daily task scheduled at 17:40 Paris time")
+
+        # Load the models and the word ID cache in the background so the daily job never waits on them mid-run
+        if warm_up_task is None:
+            warm_up_task = asyncio.create_task(warm_up())
+
+        # Classify and store the queued articles at the pace Back-ai allows
+        if ai_queue_task is None:
+            ai_queue_task = asyncio.create_task(run_ai_queue_consumer())
+            logger.info("📥 AI analysis queue consumer started")
         yield
     finally:
+        if ai_queue_task is not None:
+            ai_queue_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await ai_queue_task
+            ai_queue_task = None
+            logger.info("🛑 AI analysis queue consumer stopped.")
         if scheduler.running:
             scheduler.shutdown(wait=False)  # Prevent blocking shutdown
             logger.info("🛑 APScheduler shutdown.")
+        await close_http_client()
 
 
 # Create the FastAPI app with the lifespan context manager.
@@ -59,4 +95,16 @@ app = FastAPI(
     lifespan=lifespan,
     title="Medianalytics Data Service",
     version="1.0.0",
-)
\ No newline at end of file
+)
+
+
+# Health check endpoint
+@app.get("/health")
+async def health_check():
+    return {
+        "status": "healthy",
+        "service": "back-data",
+        "scheduler_running": scheduler.running,
+        "database_pool": get_pool_stats(),
+        "word_cache": WORD_CACHE.stats(),
+    }
@@ -0,0 +1,385 @@
+"""
+This module contains benchmark scripts for the article processing pipeline.
+It's designed to measure the per-article cost of the processing steps and to check
+that optimised implementations keep the output of the previous ones.
+
+USE CASE:
+- Run this script inside the back-data docker container before and after changing a processing step
+- Compare the reported timings per article
+- Check that the parity assertions pass
+
++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+python3 media_benchmark.py clean_text --repeat 200
+python3 media_benchmark.py chunk_text --length 40000
+python3 media_benchmark.py summarize --articles 2 --length 30000
+python3 media_benchmark.py extractive --length 60000 --repeat 5
+python3 media_benchmark.py ingestion --writers 8 --articles 200
+
+++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import time
+from collections import Counter
+from datetime import date
+from utils.text_utils import clean_text
+
+
+SAMPLE_WORDS = (
+    "The", "government", "announced", "on", "Monday", "a", "new", "trade-war", "policy",
+    "U.S.", "China's", "e-commerce", "firms", "said", "(2024)", "5%", "x-ray", "well-known",
+    "officials", "—", "prime", "minister's", "\"reforms\"", "e-mail", "I", "snake_case",
+    "São", "Paulo", "élection", "€20bn", "...", "it's", "post-war", "Q&A", "a.m.",
+)
+
+
+def build_article(length: int, seed: int = 0) -> str:
+    """
+    Builds a pseudo article mixing words, punctuation, numbers and accents.
+    Args:
+        length (int): Approximate length of the article in characters.
+        seed (int): Seed for the random generator.
+    Returns:
+        str: The generated article.
+    """
+    rng = random.Random(seed)
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(SAMPLE_WORDS)
+        if rng.random() < 0.08:
+            word += rng.choice((".", ",", ":", ";", "!", "?\n"))
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+# Edge cases for clean_text parity: intra-word hyphens, underscores, digits, single letters,
+# unicode letters and digits, and mixed whitespace.
+CLEAN_TEXT_CASES = (
+    "",
+    "a",
+    "The U.S.-China trade-war (2024) hit e-commerce_firms' stocks by 5%: a 'well-known' x-ray!",
+    "snake_case-word _-b a_-b a-_ a--b -ab ab- 9-ab ab-9",
+    "x-a-yz a-b e-mail",
+    "São Paulo élection ²³ ٣٤ İstanbul ǅemal",
+    "tabs\tand\nnew\x1clines   ",
+)
+
+
+def legacy_clean_text(text: str) -> str:
+    """Previous four-pass implementation of clean_text, kept as parity reference."""
+    cleaned_text = re.sub(r"[0-9]", " ", text.lower())
+    cleaned_text = re.sub(r"(?:_|[^\s\w])(?!(?<=\w\-)\w)", " ", cleaned_text)
+    cleaned_text = re.sub(r"\b\w\b", " ", cleaned_text)
+    return re.sub(r"\s+", " ", cleaned_text).strip()
+
+
+def time_per_call(func, *args, repeat: int = 100) -> float:
+    """
+    Measures the average time of a function call.
+    Returns:
+        float: Average time per call in milliseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def bench_clean_text(args):
+    articles = [build_article(args.length, seed) for seed in range(args.articles)]
+
+    for article in CLEAN_TEXT_CASES + tuple(articles):
+        assert clean_text(article) == legacy_clean_text(article), "clean_text parity failed"
+    print(f"Parity OK on {len(CLEAN_TEXT_CASES)} edge cases and {len(articles)} articles of ~{args.length} chars")
+
+    legacy_ms = sum(time_per_call(legacy_clean_text, a, repeat=args.repeat) for a in articles) / len(articles)
+    current_ms = sum(time_per_call(clean_text, a, repeat=args.repeat) for a in articles) / len(articles)
+    print(f"legacy clean_text:  {legacy_ms:.3f} ms/article")
+    print(f"current clean_text: {current_ms:.3f} ms/article ({legacy_ms / current_ms:.2f}x)")
+
+
+def legacy_chunk_text(text, tokenizer, chunk_size, overlap):
+    """Previous implementation of chunk_text, clamping token by token, kept as parity reference."""
+    tokens = tokenizer(text, return_tensors="pt", truncation=False)["input_ids"][0]
+    max_token_id = tokenizer.vocab_size - 1
+    for i in range(0, len(tokens), chunk_size - overlap):
+        chunk = tokens[i:i + chunk_size]
+        chunk = [min(token_id, max_token_id) for token_id in chunk]
+        yield tokenizer.decode(chunk)
+
+
+def bench_chunk_text(args):
+    from transformers import BartTokenizer
+    from services.summarizer import chunk_text, CHUNK_SIZE, OVERLAP
+
+    tokenizer = BartTokenizer.from_pretrained("facebook/bart-large-cnn", use_fast=True)
+    articles = [build_article(args.length, seed) for seed in range(args.articles)]
+
+    for article in articles:
+        assert chunk_text(article, tokenizer, CHUNK_SIZE, OVERLAP) == list(
+            legacy_chunk_text(article, tokenizer, CHUNK_SIZE, OVERLAP)
+        ), "chunk_text parity failed"
+    print(f"Parity OK on {len(articles)} articles of ~{args.length} chars")
+
+    repeat = max(1, args.repeat // 10)
+    legacy_ms = sum(
+        time_per_call(lambda a: list(legacy_chunk_text(a, tokenizer, CHUNK_SIZE, OVERLAP)), a, repeat=repeat)
+        for a in articles
+    ) / len(articles)
+    current_ms = sum(
+        time_per_call(chunk_text, a, tokenizer, CHUNK_SIZE, OVERLAP, repeat=repeat) for a in articles
+    ) / len(articles)
+    print(f"legacy chunk_text:  {legacy_ms:.2f} ms/article")
+    print(f"current chunk_text: {current_ms:.2f} ms/article ({legacy_ms / current_ms:.2f}x)")
+
+
+def unigram_f1(candidate: str, reference: str) -> float:
+    """ROUGE-1 like F1 between two texts, used to compare summaries."""
+    candidate_counts = Counter(clean_text(candidate).split())
+    reference_counts = Counter(clean_text(reference).split())
+    overlap = sum((candidate_counts & reference_counts).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(candidate_counts.values())
+    recall = overlap / sum(reference_counts.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def bench_summarize(args):
+    from services.summarizer import (
+        BartSummarizer, ExtractiveSummarizer, chunk_text, load_summarizer,
+        CHUNK_SIZE, OVERLAP, SUMMARY_BATCH_SIZE
+    )
+
+    bart = BartSummarizer()
+    bart.load()
+    tokenizer, summarizer = bart.tokenizer, bart.pipeline
+    quantized = load_summarizer(bart.model_name, tokenizer, quantize=True)
+    extractive = ExtractiveSummarizer()
+
+    for seed in range(args.articles):
+        article = build_article(args.length, seed)
+        chunks = chunk_text(article, tokenizer, CHUNK_SIZE, OVERLAP)
+
+        start = time.perf_counter()
+        per_chunk = " ".join(summarizer(chunk, batch_size=1)[0]["summary_text"] for chunk in chunks)
+        per_chunk_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = bart.summarize(article)
+        batched_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        int8 = " ".join(
+            summary["summary_text"] for summary in quantized(chunks, batch_size=SUMMARY_BATCH_SIZE)
+        )
+        int8_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        extracted = extractive.summarize(article)
+        extractive_s = time.perf_counter() - start
+
+        print(f"Article {seed}: {len(article)} chars, {len(chunks)} chunks")
+        print(f"  per chunk fp32: {per_chunk_s:.2f}s")
+        print(f"  batched fp32:   {batched_s:.2f}s (unigram F1 vs per chunk {unigram_f1(batched, per_chunk):.3f})")
+        print(f"  batched int8:   {int8_s:.2f}s (unigram F1 vs fp32 {unigram_f1(int8, batched):.3f})")
+        print(
+            f"  extractive:     {extractive_s * 1000:.2f}ms, {len(extracted)} chars "
+            f"(unigram F1 vs fp32 {unigram_f1(extracted, batched):.3f})"
+        )
+
+
+def bench_extractive(args):
+    from services.summarizer import ExtractiveSummarizer, TEXT_SIZE
+
+    extractive = ExtractiveSummarizer()
+    articles = [build_article(args.length, seed) for seed in range(args.articles)]
+    ms = sum(time_per_call(extractive.summarize, a, repeat=args.repeat) for a in articles) / len(articles)
+    kept = sum(len(extractive.summarize(a)) for a in articles) / sum(len(a) for a in articles)
+    assert all(len(extractive.summarize(a)) <= TEXT_SIZE for a in articles), "extractive summary too long"
+
+    print(f"extractive summarize: {ms:.2f} ms/article, {kept * 100:.1f}% of the text kept")
+
+
+BENCH_URL = "https://ingestion-benchmark.invalid"
+BENCH_WORD_PREFIX = "benchword"
+
+
+def build_frequency_words(rng: random.Random, vocabulary: int, size: int) -> dict[str, int]:
+    """
+    Draws the word frequencies of an article from a Zipf-like vocabulary, so a few words
+    appear in every article as "government" does in the real ones.
+    """
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    words = rng.choices(range(vocabulary), weights=weights, k=size)
+    return {f"{BENCH_WORD_PREFIX}{index:05d}": count for index, count in Counter(words).items()}
+
+
+async def legacy_insert_words_and_facts(db, article_id: int, frequency_words: dict[str, int]) -> None:
+    """Previous row-by-row path: one upsert incrementing count_repeated and one facts insert per word."""
+    from sqlalchemy.dialects.postgresql import insert
+    import config.db_models as models
+
+    for word, count in frequency_words.items():
+        result = await db.execute(
+            insert(models.Word)
+            .values(name=word, grammar="unknown", count_repeated=count)
+            .on_conflict_do_update(
+                index_elements=["name"],
+                set_={"count_repeated": models.Word.count_repeated + count},
+            )
+            .returning(models.Word.id)
+        )
+        await db.execute(
+            insert(models.Facts).values(id_article=article_id, id_word=result.scalar(), frequency=count)
+        )
+
+
+async def run_ingestion(mode: str, articles: list[dict[str, int]], writers: int, media_id: int) -> dict:
+    """
+    Stores the articles with concurrent writers, each article in its own transaction.
+    Returns:
+        dict: Per-article latencies in seconds, indexes of the stored articles, failed articles and total duration.
+    """
+    from repository.database import session_scope
+    from repository.repository_services import create_article_with_words_and_facts, insert_article
+    import models.py_schemas as schemas
+    import config.db_models as models
+
+    latencies = []
+    stored = []
+    failures = 0
+    queue = list(enumerate(articles))
+
+    async def store(i: int, frequency_words: dict[str, int]) -> None:
+        article = schemas.ArticleCreate(
+            media_id=media_id,
+            title=f"Ingestion benchmark {i}",
+            url=f"{BENCH_URL}/{mode}/{i}",
+            article="Ingestion benchmark article",
+            sentiments=[],
+            ideologies=[],
+            common_words={},
+            entities={},
+            count_words=sum(frequency_words.values()),
+            length=0,
+            insert_date=date.today(),
+        )
+        if mode == "deferred":
+            await create_article_with_words_and_facts(article, frequency_words, {})
+            return
+        db_article = models.Article(**article.model_dump())
+        db_article.url = str(db_article.url)
+        async with session_scope() as db:
+            article_id = await insert_article(db, db_article)
+            await legacy_insert_words_and_facts(db, article_id, frequency_words)
+
+    async def writer() -> None:
+        nonlocal failures
+        while queue:
+            i, frequency_words = queue.pop()
+            start = time.perf_counter()
+            try:
+                await store(i, frequency_words)
+                latencies.append(time.perf_counter() - start)
+                stored.append(i)
+            except Exception as e:  # Deadlocks of the legacy path are counted, not retried
+                failures += 1
+                print(f"  {mode} article {i} failed: {type(e).__name__}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(writers)))
+    return {"latencies": latencies, "stored": stored, "failures": failures, "duration": time.perf_counter() - start}
+
+
+async def cleanup_ingestion() -> None:
+    """Deletes the benchmark articles, their facts and the benchmark words."""
+    from sqlalchemy import delete, select
+    from repository.database import session_scope
+    import config.db_models as models
+
+    bench_articles = select(models.Article.id).where(models.Article.url.startswith(BENCH_URL))
+    async with session_scope() as db:
+        await db.execute(delete(models.Facts).where(models.Facts.id_article.in_(bench_articles)))
+        await db.execute(delete(models.Article).where(models.Article.url.startswith(BENCH_URL)))
+        await db.execute(delete(models.Word).where(models.Word.name.startswith(BENCH_WORD_PREFIX)))
+
+
+async def bench_ingestion_async(args):
+    from sqlalchemy import select
+    from repository.database import session_scope
+    from repository.repository_services import get_media_id_url, refresh_word_counts
+    import config.db_models as models
+
+    medias = await get_media_id_url()
+    if not medias:
+        print("No active media in the database to attach the benchmark articles to")
+        return
+    media_id = medias[0]["id"]
+
+    rng = random.Random(0)
+    articles = [build_frequency_words(rng, args.vocabulary, args.length // 6) for _ in range(args.articles)]
+    expected = Counter()
+
+    await cleanup_ingestion()
+    try:
+        for mode in ("legacy", "deferred"):
+            results = await run_ingestion(mode, articles, args.writers, media_id)
+            latencies = sorted(results["latencies"])
+            stored = len(latencies)
+            print(
+                f"{mode:<9} {args.writers} writers: {stored / results['duration']:7.1f} articles/s, "
+                f"p50 {latencies[stored // 2] * 1000 if stored else 0:7.1f} ms, "
+                f"p95 {latencies[int(stored * 0.95)] * 1000 if stored else 0:7.1f} ms, "
+                f"{results['failures']} failed"
+            )
+            for i in results["stored"]:
+                expected.update(articles[i])
+
+            if mode == "deferred":
+                start = time.perf_counter()
+                refreshed = await refresh_word_counts()
+                print(f"refresh_word_counts: {refreshed} words in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        async with session_scope() as db:
+            result = await db.execute(
+                select(models.Word.name, models.Word.count_repeated)
+                .where(models.Word.name.startswith(BENCH_WORD_PREFIX))
+            )
+            counts = dict(result.all())
+        assert counts == dict(expected), "count_repeated parity with the stored frequencies failed"
+        print(f"Parity OK: count_repeated of {len(counts)} words matches the stored articles after the refresh")
+    finally:
+        await cleanup_ingestion()
+
+
+def bench_ingestion(args):
+    asyncio.run(bench_ingestion_async(args))
+
+
+BENCHMARKS = {
+    "clean_text": bench_clean_text,
+    "chunk_text": bench_chunk_text,
+    "summarize": bench_summarize,
+    "extractive": bench_extractive,
+    "ingestion": bench_ingestion,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Medianalytics data pipeline benchmarks")
+    parser.add_argument("benchmark", choices=BENCHMARKS.keys())
+    parser.add_argument("--articles", type=int, default=10, help="Number of generated articles")
+    parser.add_argument("--length", type=int, default=8000, help="Approximate article length in characters")
+    parser.add_argument("--repeat", type=int, default=50, help="Repetitions per article")
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writers (ingestion)")
+    parser.add_argument("--vocabulary", type=int, default=5000, help="Distinct words (ingestion)")
+    cli_args = parser.parse_args()
+    BENCHMARKS[cli_args.benchmark](cli_args)
@@ -130,4 +130,15 @@ class FactsCreate(FactsBase):
     Pydantic model for creating facts.
     """
 
-    pass
\ No newline at end of file
+    pass
+
+
+# ----------------- INGESTION -----------------
+class ArticleWithWords(BaseModel):
+    """
+    Pydantic model for an analyzed article with the words to store as facts.
+    """
+
+    article: ArticleCreate
+    frequency_words: dict[str, int]
+    pos_tags: dict[str, str]
@@ -2,13 +2,61 @@
 This module contains repository functions for interacting with the database.
 """
 
+from collections import Counter
+from datetime import timedelta
+from typing import Iterator
+from sqlalchemy import delete, func, or_, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from repository.database import get_session
+from repository.database import session_scope
+from repository.word_cache import WORD_CACHE, WORD_CACHE_WARM_SIZE
 import models.py_schemas as schemas
 import config.db_models as models
+from config.constant_enums import AiJobStatusEnum
+
+# Maximum bind parameters of a statement with asyncpg, multi-row statements are split below it
+MAX_QUERY_PARAMETERS = 32767
+
+
+def chunk_rows(rows: list[dict]) -> Iterator[list[dict]]:
+    """
+    Split the rows of a multi-row statement so each chunk stays under MAX_QUERY_PARAMETERS.
+    Args:
+        rows (list[dict]): The rows, all with the same columns.
+    Returns:
+        Iterator[list[dict]]: The chunks of rows.
+    """
+    if not rows:
+        return
+    size = MAX_QUERY_PARAMETERS // len(rows[0])
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def majority_pos_tags(items: list[schemas.ArticleWithWords]) -> dict[str, str]:
+    """
+    Get the majority part-of-speech tag of each word across a batch of articles.
+    The tag of a word in an article counts as many times as the word appears in it, ties are
+    resolved by first occurrence, as TextAnalyzer.get_pos_tags does within an article.
+    Args:
+        items (list[schemas.ArticleWithWords]): The analyzed articles with their words.
+    Returns:
+        dict[str, str]: A dictionary of words and their most frequent POS tags.
+    """
+    pos_counts = Counter()
+    for item in items:
+        for word, pos in item.pos_tags.items():
+            pos_counts[(word, pos)] += item.frequency_words.get(word, 1)
+
+    pos_tags = {}
+    tag_counts = {}
+    for (word, pos), count in pos_counts.items():
+        if count > tag_counts.get(word, 0):
+            tag_counts[word] = count
+            pos_tags[word] = pos
+    return pos_tags
 
 
 async def get_media_id_url() -> list[schemas.MediaCompose]:
@@ -17,7 +65,7 @@ async def get_media_id_url() -> list[schemas.MediaCompose]:
     Returns:
         list[schemas.MediaCompose]: A list of media IDs and URLs.
     """
-    async for db in get_session():
+    async with session_scope() as db:
         result = await db.execute(select(models.Media.id, models.Media.url).filter(models.Media.active.is_(True)))
         medias = result.all()
         return [schemas.MediaCompose.model_validate(media).model_dump() for media in medias]
@@ -33,7 +81,7 @@ async def get_media_id_url_by_id(media_id: int) -> list[schemas.MediaCompose]:
     Returns:
         list[schemas.MediaCompose]: A list containing the media data if found, empty list otherwise.
     """
-    async for db in get_session():
+    async with session_scope() as db:
         result = await db.execute(
             select(models.Media.id, models.Media.url)
             .filter(models.Media.id == media_id)
@@ -50,17 +98,15 @@ async def update_media_active(media_id: int) -> bool:
     Returns:
         bool: True if the update was successful, False if media not found.
     """
-    async for db in get_session():
-        try:
+    try:
+        async with session_scope() as db:
             media = await db.get(models.Media, media_id)
             if media is None:
                 return False
             media.active = False
-            await db.commit()
             return True
-        except SQLAlchemyError:
-            await db.rollback()
-            return False
+    except SQLAlchemyError:
+        return False
 
 
 async def insert_article(db: AsyncSession, db_article: models.Article) -> int:
@@ -100,57 +146,107 @@ async def insert_article(db: AsyncSession, db_article: models.Article) -> int:
     return inserted_article_id
 
 
+async def insert_words(db: AsyncSession, words: list[schemas.WordCreate]) -> dict[str, int]:
+    """
+    Insert the new words in multi-row statements and get the IDs of all the given words.
+    Existing words are left untouched (no row lock), count_repeated is maintained by refresh_word_counts.
+    Rows are sorted by name so concurrent writers of the same new words wait in the same order.
+    Args:
+        db (AsyncSession): The database session.
+        words (list[schemas.WordCreate]): The words to insert, with distinct names.
+    Returns:
+        dict[str, int]: The ID of each word by name.
+    Raises:
+        SQLAlchemyError: If a word is neither inserted nor found.
+    """
+    rows = sorted((word.model_dump() for word in words), key=lambda row: row["name"])
+    word_ids = {}
+    for chunk in chunk_rows(rows):
+        result = await db.execute(
+            insert(models.Word)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(models.Word.id, models.Word.name)
+        )
+        word_ids.update({name: word_id for word_id, name in result.all()})
+
+        existing = [row["name"] for row in chunk if row["name"] not in word_ids]
+        if existing:
+            result = await db.execute(
+                select(models.Word.id, models.Word.name).where(models.Word.name.in_(existing))
+            )
+            word_ids.update({name: word_id for word_id, name in result.all()})
+
+    if len(word_ids) != len(rows):
+        raise SQLAlchemyError("Words insertion failed.")
+    return word_ids
+
+
+async def insert_facts(db: AsyncSession, facts: list[schemas.FactsCreate]) -> None:
+    """
+    Insert the facts in multi-row statements.
+    Args:
+        db (AsyncSession): The database session.
+        facts (list[schemas.FactsCreate]): The facts to insert.
+    Returns:
+        None
+    """
+    rows = [fact.model_dump() for fact in facts]
+    for chunk in chunk_rows(rows):
+        await db.execute(insert(models.Facts).values(chunk))
+
+
+async def get_word_ids(
+    db: AsyncSession,
+    frequency_words: dict[str, int],
+    pos_tags: dict[str, str],
+) -> dict[str, int]:
+    """
+    Get the IDs of the words, from WORD_CACHE or inserting the new ones.
+    No word row is updated: count_repeated of existing words lags until the next refresh_word_counts.
+    Args:
+        db (AsyncSession): The database session.
+        frequency_words (dict[str, int]): A dictionary of words and their frequencies.
+        pos_tags (dict[str, str]): A dictionary of words and their part-of-speech tags.
+    Returns:
+        dict[str, int]: The ID of each word by name, to cache once the transaction is committed.
+    """
+    word_ids = WORD_CACHE.lookup(frequency_words)
+    words = [
+        schemas.WordCreate(name=word, grammar=pos_tags.get(word, "unknown"), count_repeated=count)
+        for word, count in frequency_words.items()
+        if word not in word_ids
+    ]
+    if words:
+        word_ids.update(await insert_words(db, words))
+    return word_ids
+
+
 async def insert_words_and_facts(
     db: AsyncSession,
     article_id: int,
     frequency_words: dict[str, int],
     pos_tags: dict[str, str],
-) -> None:
+) -> dict[str, int]:
     """
-    Insert words and facts into the database.
+    Insert the new words and the facts of an article into the database.
     Args:
         db (AsyncSession): The database session.
         article_id (int): The ID of the article.
         frequency_words (dict[str, int]): A dictionary of words and their frequencies.
         pos_tags (dict[str, str]): A dictionary of words and their part-of-speech tags.
     Returns:
-        None
+        dict[str, int]: The ID of each word by name, to cache once the transaction is committed.
     """
-    for word, count in frequency_words.items():
-        word_sche = schemas.WordCreate(
-            name=word, grammar=pos_tags.get(word, "unknown"), count_repeated=count
-        )
-        stmt_word = (
-            insert(models.Word)
-            .values(
-                name=word_sche.name,
-                grammar=word_sche.grammar,
-                count_repeated=word_sche.count_repeated,
-            )
-            .on_conflict_do_update(
-                index_elements=["name"],
-                set_={
-                    "count_repeated": models.Word.count_repeated
-                    + word_sche.count_repeated
-                },
-            )
-            .returning(models.Word.id)
-        )
-        result_word = await db.execute(stmt_word)
-        word_id = result_word.scalar()
-
-        if word_id is None:
-            raise SQLAlchemyError("Words insertion or update failed.")
-
-        fact_sche = schemas.FactsCreate(
-            id_article=article_id, id_word=word_id, frequency=count
-        )
-        stmt_fact = insert(models.Facts).values(
-            id_article=fact_sche.id_article,
-            id_word=fact_sche.id_word,
-            frequency=fact_sche.frequency,
-        )
-        await db.execute(stmt_fact)
+    if not frequency_words:
+        return {}
+    word_ids = await get_word_ids(db, frequency_words, pos_tags)
+    facts = [
+        schemas.FactsCreate(id_article=article_id, id_word=word_ids[word], frequency=count)
+        for word, count in frequency_words.items()
+    ]
+    await insert_facts(db, facts)
+    return word_ids
 
 
 async def create_article_with_words_and_facts(
@@ -170,25 +266,355 @@ async def create_article_with_words_and_facts(
     db_article = models.Article(**article.model_dump())
     db_article.url = str(db_article.url)
 
-    async for db in get_session():
-        async with db.begin():
-            try:
-                article_id = await insert_article(db, db_article)
-                await insert_words_and_facts(db, article_id, frequency_words, pos_tags)
-                await db.commit()
-            except SQLAlchemyError as e:
-                await db.rollback()
-                raise e
+    async with session_scope() as db:
+        article_id = await insert_article(db, db_article)
+        word_ids = await insert_words_and_facts(db, article_id, frequency_words, pos_tags)
+    # IDs of rolled back inserts must never be cached
+    WORD_CACHE.update(word_ids)
+
+
+async def create_articles_with_words_and_facts(items: list[schemas.ArticleWithWords]) -> list[str]:
+    """
+    Create a batch of articles with their words and facts in one transaction, with bulk statements.
+    Articles whose URL is already stored, or repeated in the batch, are skipped.
+    Args:
+        items (list[schemas.ArticleWithWords]): The analyzed articles with their words.
+    Returns:
+        list[str]: The URLs of the skipped duplicate articles.
+    Raises:
+        SQLAlchemyError: If the batch insertion fails, nothing is stored then.
+    """
+    skipped = []
+    by_url = {}
+    for item in items:
+        url = str(item.article.url)
+        if url in by_url:
+            skipped.append(url)
+        else:
+            by_url[url] = item
+    article_rows = [{**item.article.model_dump(), "url": url} for url, item in by_url.items()]
+    if not article_rows:
+        return skipped
+
+    async with session_scope() as db:
+        article_ids = {}
+        for chunk in chunk_rows(article_rows):
+            result = await db.execute(
+                insert(models.Article)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=["url"])
+                .returning(models.Article.id, models.Article.url)
+            )
+            article_ids.update({url: article_id for article_id, url in result.all()})
+
+        # Words of all the inserted articles at once, new ones start with their batch frequency
+        stored = [(article_ids[url], item) for url, item in by_url.items() if url in article_ids]
+        frequency_words = Counter()
+        for _, item in stored:
+            frequency_words.update(item.frequency_words)
+        pos_tags = majority_pos_tags([item for _, item in stored])
+        word_ids = await get_word_ids(db, dict(frequency_words), pos_tags) if frequency_words else {}
+
+        await insert_facts(db, [
+            schemas.FactsCreate(id_article=article_id, id_word=word_ids[word], frequency=count)
+            for article_id, item in stored
+            for word, count in item.frequency_words.items()
+        ])
+    # IDs of rolled back inserts must never be cached
+    WORD_CACHE.update(word_ids)
+    skipped.extend(url for url in by_url if url not in article_ids)
+    return skipped
+
+
+async def warm_word_cache(limit: int = WORD_CACHE_WARM_SIZE) -> int:
+    """
+    Load the IDs of the most frequent words into WORD_CACHE.
+    Args:
+        limit (int): Maximum number of words to load.
+    Returns:
+        int: The number of loaded words.
+    """
+    if limit <= 0:
+        return 0
+    async with session_scope() as db:
+        result = await db.execute(
+            select(models.Word.name, models.Word.id)
+            .order_by(models.Word.count_repeated.desc())
+            .limit(limit)
+        )
+        # Least frequent first, so the most frequent ones are evicted last
+        word_ids = dict(reversed(result.all()))
+        WORD_CACHE.update(word_ids)
+        return len(word_ids)
+
+
+async def refresh_word_counts() -> int:
+    """
+    Set count_repeated of each word to the sum of its frequencies in the facts.
+    Ingestion only appends facts, so the counts are exact right after this refresh and lag
+    behind the articles stored since then (new words start with their first article frequency).
+    Returns:
+        int: The number of words whose count changed.
+    """
+    totals = (
+        select(models.Facts.id_word, func.sum(models.Facts.frequency).label("total"))
+        .group_by(models.Facts.id_word)
+        .subquery()
+    )
+    async with session_scope() as db:
+        result = await db.execute(
+            update(models.Word)
+            .where(
+                models.Word.id == totals.c.id_word,
+                models.Word.count_repeated.is_distinct_from(totals.c.total),
+            )
+            .values(count_repeated=totals.c.total)
+        )
+        return result.rowcount
 
 
 async def check_article_exists(url: str) -> bool:
     """
-    Check if an article with the given URL already exists in the database.
+    Check if an article with the given URL already exists in the database or in the AI analysis queue.
     Args:
         url (str): The URL of the article.
     Returns:
         bool: True if the article exists, otherwise False.
     """
-    async for db in get_session():
-        result = await db.execute(select(models.Article.url).filter(models.Article.url == url.strip()))
+    url = url.strip()
+    async with session_scope() as db:
+        result = await db.execute(select(models.Article.url).filter(models.Article.url == url))
+        if result.scalar() is not None:
+            return True
+        # Articles waiting for the AI analysis (or dead-lettered) are not scraped again
+        result = await db.execute(select(models.AiAnalysisJob.id).filter(models.AiAnalysisJob.url == url))
         return result.scalar() is not None
+
+
+async def get_analysis_cache(key: str) -> models.AnalysisCache | None:
+    """
+    Retrieve an analysis cache entry and mark it as used.
+    Args:
+        key (str): The hash of the cleaned article text.
+    Returns:
+        models.AnalysisCache | None: The cache entry if found, otherwise None.
+    """
+    try:
+        async with session_scope() as db:
+            result = await db.execute(
+                update(models.AnalysisCache)
+                .where(models.AnalysisCache.key == key)
+                .values(hits=models.AnalysisCache.hits + 1, last_used=func.now())
+                .returning(models.AnalysisCache)
+            )
+            entry = result.scalar()
+            return entry
+    except SQLAlchemyError:
+        return None
+
+
+async def upsert_analysis_cache(
+    key: str,
+    text_analysis: dict | None = None,
+    ai_analysis: dict | None = None,
+) -> None:
+    """
+    Insert or update an analysis cache entry, keeping the stored results not given.
+    Args:
+        key (str): The hash of the cleaned article text.
+        text_analysis (dict | None): The serialized ArticleText result.
+        ai_analysis (dict | None): The serialized ArticleAi result.
+    Returns:
+        None
+    """
+    stmt = insert(models.AnalysisCache).values(
+        key=key,
+        text_analysis=text_analysis,
+        ai_analysis=ai_analysis,
+        hits=0,
+        last_used=func.now(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={
+            "text_analysis": func.coalesce(stmt.excluded.text_analysis, models.AnalysisCache.text_analysis),
+            "ai_analysis": func.coalesce(stmt.excluded.ai_analysis, models.AnalysisCache.ai_analysis),
+            "last_used": func.now(),
+        },
+    )
+    async with session_scope() as db:
+        await db.execute(stmt)
+
+
+async def evict_analysis_cache(max_entries: int) -> int:
+    """
+    Delete the least recently used analysis cache entries above the given size.
+    Args:
+        max_entries (int): Maximum number of entries to keep.
+    Returns:
+        int: The number of deleted entries.
+    """
+    keep_keys = (
+        select(models.AnalysisCache.key)
+        .order_by(models.AnalysisCache.last_used.desc())
+        .limit(max_entries)
+    )
+    try:
+        async with session_scope() as db:
+            result = await db.execute(
+                delete(models.AnalysisCache).where(models.AnalysisCache.key.not_in(keep_keys))
+            )
+            return result.rowcount
+    except SQLAlchemyError:
+        return 0
+
+
+async def enqueue_ai_job(
+    media_id: int,
+    title: str,
+    url: str,
+    article: str,
+    cache_key: str,
+    text_analysis: dict,
+) -> None:
+    """
+    Add an article waiting for the AI analysis to the queue, ignored if its URL is already queued.
+    Args:
+        media_id (int): The ID of the media source.
+        title (str): The title of the article.
+        url (str): The URL of the article.
+        article (str): The raw article text to classify.
+        cache_key (str): The analysis cache key of the article.
+        text_analysis (dict): The serialized ArticleText result.
+    Returns:
+        None
+    """
+    stmt = (
+        insert(models.AiAnalysisJob)
+        .values(
+            media_id=media_id,
+            title=title,
+            url=url,
+            article=article,
+            cache_key=cache_key,
+            text_analysis=text_analysis,
+            status=AiJobStatusEnum.PENDING,
+            attempts=0,
+            next_attempt_at=func.now(),
+            created_at=func.now(),
+        )
+        .on_conflict_do_nothing(index_elements=["url"])
+    )
+    async with session_scope() as db:
+        await db.execute(stmt)
+
+
+async def claim_ai_jobs(limit: int) -> list[models.AiAnalysisJob]:
+    """
+    Claim the next pending jobs due for an attempt, skipping the ones locked by other consumers.
+    Claimed jobs are marked as PROCESSING and their attempts incremented.
+    Args:
+        limit (int): Maximum number of jobs to claim.
+    Returns:
+        list[models.AiAnalysisJob]: The claimed jobs, oldest due first.
+    """
+    stmt = (
+        select(models.AiAnalysisJob)
+        .where(
+            models.AiAnalysisJob.status == AiJobStatusEnum.PENDING,
+            models.AiAnalysisJob.next_attempt_at <= func.now(),
+        )
+        .order_by(models.AiAnalysisJob.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    async with session_scope() as db:
+        jobs = (await db.execute(stmt)).scalars().all()
+        for job in jobs:
+            job.status = AiJobStatusEnum.PROCESSING
+            job.attempts += 1
+        return list(jobs)
+
+
+async def delete_ai_jobs(job_ids: list[int]) -> None:
+    """
+    Delete completed jobs from the AI analysis queue.
+    Args:
+        job_ids (list[int]): The IDs of the jobs.
+    Returns:
+        None
+    """
+    async with session_scope() as db:
+        await db.execute(delete(models.AiAnalysisJob).where(models.AiAnalysisJob.id.in_(job_ids)))
+
+
+async def fail_ai_job(job_id: int, error: str, retry_delay: float | None) -> None:
+    """
+    Record a failed attempt of a job, retried after a delay or dead-lettered.
+    Args:
+        job_id (int): The ID of the job.
+        error (str): The error of the attempt.
+        retry_delay (float | None): Seconds before the next attempt, None to mark the job as DEAD.
+    Returns:
+        None
+    """
+    values = {"last_error": error[:2000]}
+    if retry_delay is None:
+        values["status"] = AiJobStatusEnum.DEAD
+    else:
+        values["status"] = AiJobStatusEnum.PENDING
+        values["next_attempt_at"] = func.now() + timedelta(seconds=retry_delay)
+    async with session_scope() as db:
+        await db.execute(
+            update(models.AiAnalysisJob).where(models.AiAnalysisJob.id == job_id).values(**values)
+        )
+
+
+async def requeue_processing_ai_jobs() -> int:
+    """
+    Set the jobs left as PROCESSING by a stopped consumer back to PENDING.
+    Returns:
+        int: The number of requeued jobs.
+    """
+    try:
+        async with session_scope() as db:
+            result = await db.execute(
+                update(models.AiAnalysisJob)
+                .where(models.AiAnalysisJob.status == AiJobStatusEnum.PROCESSING)
+                .values(status=AiJobStatusEnum.PENDING, next_attempt_at=func.now())
+            )
+            return result.rowcount
+    except SQLAlchemyError:
+        return 0
+
+
+async def count_due_ai_jobs() -> int:
+    """
+    Count the jobs being processed or pending and due for an attempt.
+    Returns:
+        int: The number of jobs.
+    """
+    async with session_scope() as db:
+        result = await db.execute(
+            select(func.count()).select_from(models.AiAnalysisJob).where(
+                or_(
+                    models.AiAnalysisJob.status == AiJobStatusEnum.PROCESSING,
+                    (models.AiAnalysisJob.status == AiJobStatusEnum.PENDING)
+                    & (models.AiAnalysisJob.next_attempt_at <= func.now()),
+                )
+            )
+        )
+        return result.scalar()
+
+
+async def count_ai_jobs_by_status() -> dict[str, int]:
+    """
+    Count the jobs of the AI analysis queue by status.
+    Returns:
+        dict[str, int]: The number of jobs of each status.
+    """
+    async with session_scope() as db:
+        result = await db.execute(
+            select(models.AiAnalysisJob.status, func.count()).group_by(models.AiAnalysisJob.status)
+        )
+        return {status.value: count for status, count in result.all()}
@@ -0,0 +1,81 @@
+"""
+In-process LRU cache of the word IDs by name for the ingestion path.
+Known words skip the insert returning their ID, only their facts are written.
+"""
+
+import os
+from collections import OrderedDict
+
+
+# Maximum number of word IDs kept in memory, the least recently used ones are evicted
+WORD_CACHE_SIZE = int(os.getenv("WORD_CACHE_SIZE", "50000"))
+# Most frequent words loaded at startup and before each daily job, 0 to disable the warm-up
+WORD_CACHE_WARM_SIZE = int(os.getenv("WORD_CACHE_WARM_SIZE", "20000"))
+
+
+class WordIdCache:
+    """
+    LRU mapping of word names to their IDs in the word table.
+    Only IDs of committed rows must be added, words are never deleted so the entries do not expire.
+    """
+
+    def __init__(self, max_size: int = WORD_CACHE_SIZE):
+        self.max_size = max_size
+        self._ids: OrderedDict[str, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def lookup(self, names) -> dict[str, int]:
+        """
+        Get the cached IDs of the given words, marking them as recently used.
+        Args:
+            names (Iterable[str]): The word names.
+        Returns:
+            dict[str, int]: The ID of each cached word by name.
+        """
+        found = {}
+        for name in names:
+            word_id = self._ids.get(name)
+            if word_id is None:
+                self.misses += 1
+                continue
+            self._ids.move_to_end(name)
+            found[name] = word_id
+            self.hits += 1
+        return found
+
+    def update(self, word_ids: dict[str, int]) -> None:
+        """
+        Add committed word IDs, evicting the least recently used entries above max_size.
+        Args:
+            word_ids (dict[str, int]): The ID of each word by name.
+        """
+        if self.max_size <= 0:
+            return
+        for name, word_id in word_ids.items():
+            self._ids[name] = word_id
+            self._ids.move_to_end(name)
+        while len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+
+    def stats(self) -> dict:
+        """
+        Get the cache statistics since the service started.
+        Returns:
+            dict: Size, hits, misses and hit rate.
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._ids),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 2) if total else 0.0,
+        }
+
+
+# Shared cache of the data service, written only after the ingestion transactions commit
+WORD_CACHE = WordIdCache()
@@ -1,6 +1,8 @@
+import asyncio
 import aiohttp
-from transformers import BartTokenizer, pipeline
 from config.sentiments_ideologies_enums import SentimentsEnum, IdeologiesEnum
+from services.summarizer import TEXT_SIZE, get_summarizer
+from utils.http_client import request_json
 
 API_VERSION = "v1"
 URL = f"http://back-ai:9000/ai/{API_VERSION}" # Docker service name
@@ -11,91 +13,69 @@ HEADERS = {
 
 GET_ATTRIBUTE = "response"  # Attribute to extract from the response
 
-async def make_request(text: str, endpoint: str) -> list[IdeologiesEnum] | list[SentimentsEnum] | None:
+async def make_request(text: str, endpoint: str) -> list[IdeologiesEnum] | list[SentimentsEnum] | dict | None:
     """Make async request to API endpoint."""
     analysis_url = URL + endpoint
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(
-                analysis_url, 
-                headers=HEADERS, 
-                json={"text": text}
-            ) as response:
-                response.raise_for_status()
-                response_data = await response.json()
-                return response_data.get(GET_ATTRIBUTE)
-        except aiohttp.ClientError as e:
-            print(f"An error occurred with POST request to {endpoint}: {e}")
-            return None
+    try:
+        response_data = await request_json(
+            "back-ai", "POST", analysis_url, headers=HEADERS, json={"text": text}
+        )
+        return response_data.get(GET_ATTRIBUTE)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"An error occurred with POST request to {endpoint}: {e!r}")
+        return None
 
 
-def chunk_text(text, tokenizer: BartTokenizer, chunk_size, overlap):
-    tokens = tokenizer(text, return_tensors="pt", truncation=False)["input_ids"][0]
-    max_token_id = tokenizer.vocab_size - 1  # Get the maximum token ID for the tokenizer
-
-    for i in range(0, len(tokens), chunk_size - overlap):
-        chunk = tokens[i:i + chunk_size]
-        # Ensure all token IDs are within the valid range
-        chunk = [min(token_id, max_token_id) for token_id in chunk]
-        yield tokenizer.decode(chunk)
-
+async def make_batch_request(texts: list[str], endpoint: str, priority: str = "normal") -> list[dict]:
+    """
+    Make async request to a batch API endpoint.
+    Returns one item per text, in order, each with a response or an error.
+    Priority ("high", "normal" or "low") orders the requests waiting for the provider quota.
+    """
+    analysis_url = URL + "/batch" + endpoint
+    try:
+        response_data = await request_json(
+            "back-ai", "POST", analysis_url, headers=HEADERS, json={"texts": texts, "priority": priority}
+        )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"An error occurred with POST request to /batch{endpoint}: {e!r}")
+        return [{"response": None, "error": str(e)} for _ in texts]
 
-TEXT_SIZE = 19000
+    # Items are paired with the texts by position, an unexpected body fails every item
+    items = response_data.get(GET_ATTRIBUTE) if isinstance(response_data, dict) else None
+    if not isinstance(items, list) or len(items) != len(texts) or not all(isinstance(item, dict) for item in items):
+        error = f"Unexpected response from /batch{endpoint}: {len(texts)} items expected"
+        print(error)
+        return [{"response": None, "error": error} for _ in texts]
+    return items
 
-CHUNK_SIZE = 1000  # Adjust to model's max token limit
-OVERLAP = 100  # Overlap ensures context continuity
 
 class AiAnalyzer:
     """AI Text Analysis Class
-    This class provides text analysis capabilities using pre-trained AI models,
-    including text summarization, ideology analysis, and sentiment analysis.
-    The class uses the BART model from Facebook for text summarization and makes API
-    requests for ideological and sentiment analysis.
-    Class Attributes:
-        _tokenizer (BartTokenizer): Tokenizer instance for text processing
-        _summarizer (pipeline): Summarization pipeline instance
+    This class provides text analysis capabilities, including text summarization,
+    ideology analysis, and sentiment analysis.
+    Texts longer than TEXT_SIZE are summarized with the configured strategy of
+    services.summarizer (BART or extractive) and API requests are made for
+    ideological and sentiment analysis.
     Methods:
-        _initialize_models(): Initializes the BART tokenizer and summarization pipeline
-        analyze_text(text): Processes and summarizes long text by chunks
+        create(text): Creates an analyzer, summarizing long texts first
         extract_ideology(): Analyzes ideology of the text
         extract_sentiment(): Analyzes sentiment of the text
+        extract_analysis(): Analyzes ideology and sentiment of the text in a single request
     Args:
-        text (str): The input text to be analyzed. If longer than TEXT_SIZE, 
-                    it will be automatically summarized.
+        text (str): The input text to be analyzed. Use create() so texts longer than
+                    TEXT_SIZE are summarized first.
     """
-    _tokenizer = None
-    _summarizer = None
-    
-    @classmethod 
-    def _initialize_models(cls):
-        if cls._tokenizer is None or cls._summarizer is None:
-            # Initialize both models in one go to reduce overhead
-            model_name = "facebook/bart-large-cnn"
-            cls._tokenizer = BartTokenizer.from_pretrained(
-                model_name,
-                use_fast=True # Use faster tokenizer implementation
-            )
-            cls._summarizer = pipeline(
-                "summarization",
-                model=model_name, 
-                tokenizer=cls._tokenizer, # Reuse tokenizer
-                device="cpu",
-                framework="pt", # Explicitly use PyTorch
-                batch_size=1, # Control memory usage
-            )
 
     @classmethod
-    def analyze_text(cls, text):
-        cls._initialize_models()
-        chunks = chunk_text(text, cls._tokenizer, CHUNK_SIZE, OVERLAP)
-        summaries = [cls._summarizer(chunk)[0]['summary_text'] for chunk in chunks]
-        return " ".join(summaries)
+    async def create(cls, text: str) -> "AiAnalyzer":
+        """Create an analyzer, summarizing texts longer than TEXT_SIZE first."""
+        if len(text) > TEXT_SIZE:
+            text = await get_summarizer().summarize_async(text)
+        return cls(text)
 
     def __init__(self, text: str):
-        if len(text) > TEXT_SIZE:
-            self.text = self.__class__.analyze_text(text)
-        else:
-            self.text = text
+        self.text = text
 
     async def extract_ideology(self) -> list[IdeologiesEnum] | None:
         """Get ideology analysis."""
@@ -103,4 +83,18 @@ class AiAnalyzer:
 
     async def extract_sentiment(self) -> list[SentimentsEnum] | None:
         """Get sentiment analysis.""" 
-        return await make_request(self.text, "/generate_sentiment")
\ No newline at end of file
+        return await make_request(self.text, "/generate_sentiment")
+
+    async def extract_analysis(self) -> dict[str, list] | None:
+        """Get ideology and sentiment analysis in a single request."""
+        return await make_request(self.text, "/generate_analysis")
+
+    @staticmethod
+    async def extract_analysis_batch(
+        analyzers: list["AiAnalyzer"], priority: str = "normal"
+    ) -> list[dict[str, list] | None]:
+        """Get ideology and sentiment analysis of several texts in a single request, None for failed items."""
+        items = await make_batch_request(
+            [analyzer.text for analyzer in analyzers], "/generate_analysis", priority
+        )
+        return [item.get(GET_ATTRIBUTE) for item in items]
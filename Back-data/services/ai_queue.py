@@ -0,0 +1,267 @@
+"""
+Module for the durable queue of articles waiting for the AI analysis.
+Scraping stores the NLP-analyzed articles in the ai_analysis_queue table and moves on, a
+background consumer classifies them in batches at the pace Back-ai allows (its rate limiter
+holds the requests) and stores the articles of each batch in one transaction.
+Failed attempts are retried with an exponential delay, and dead-lettered after AI_QUEUE_MAX_ATTEMPTS.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from models.py_schemas import ArticleAi, ArticleCreate, ArticleText, ArticleWithWords
+from repository.repository_services import (
+    create_article_with_words_and_facts,
+    create_articles_with_words_and_facts,
+    enqueue_ai_job,
+    claim_ai_jobs,
+    delete_ai_jobs,
+    fail_ai_job,
+    requeue_processing_ai_jobs,
+    count_due_ai_jobs,
+    count_ai_jobs_by_status,
+)
+from services.ai_analyzer import AiAnalyzer
+from services.analysis_cache import cache_analysis
+
+logger = logging.getLogger(__name__)
+
+
+AI_QUEUE_BATCH_SIZE = int(os.getenv("AI_QUEUE_BATCH_SIZE", "5"))  # Articles per Back-ai batch request
+AI_QUEUE_MAX_ATTEMPTS = int(os.getenv("AI_QUEUE_MAX_ATTEMPTS", "5"))
+AI_QUEUE_RETRY_DELAY = float(os.getenv("AI_QUEUE_RETRY_DELAY", "60"))  # Seconds, doubled on each attempt
+AI_QUEUE_POLL_INTERVAL = float(os.getenv("AI_QUEUE_POLL_INTERVAL", "10"))  # Seconds between polls when idle
+AI_QUEUE_DRAIN_TIMEOUT = float(os.getenv("AI_QUEUE_DRAIN_TIMEOUT", "1800"))  # Max wait at the end of the daily job
+
+# Queue statistics
+_queue_stats = {
+    "enqueued": 0,
+    "stored": 0,
+    "duplicates": 0,
+    "retried": 0,
+    "dead_lettered": 0,
+}
+
+
+def validate_ai_analysis(analysis: dict | None) -> ArticleAi:
+    """
+    Validates the AI analysis of an article.
+    Args:
+        analysis (dict | None): The ideologies and sentiments returned by Back-ai.
+    Returns:
+        ArticleAi: An object containing the analyzed AI data.
+    Raises:
+        Exception: If the ideologies or sentiments are missing or less than 3.
+    """
+    analysis = analysis or {}
+
+    ideologies = analysis.get("ideologies")
+    logger.info(f"Extract ideology: {ideologies}")
+    if not ideologies or len(ideologies) < 3:
+        raise Exception("Ideology extraction failed.")
+
+    sentiments = analysis.get("sentiments")
+    logger.info(f"Extract main sentiment: {sentiments}")
+    if not sentiments or len(sentiments) < 3:
+        raise Exception("Sentiment extraction failed.")
+
+    return ArticleAi(sentiments=sentiments, ideologies=ideologies)
+
+
+def build_article(
+    media_id: int, title: str, href: str, text_obj: ArticleText, ai_obj: ArticleAi
+) -> ArticleWithWords:
+    """
+    Builds an analyzed article with its words to store.
+    Args:
+        media_id (int): The ID of the media source.
+        title (str): The title of the article.
+        href (str): The URL of the article.
+        text_obj (ArticleText): The text analysis result.
+        ai_obj (ArticleAi): The AI analysis result.
+    Returns:
+        ArticleWithWords: The article with its word frequencies and part-of-speech tags.
+    """
+    db_article = ArticleCreate(
+        media_id=media_id,
+        title=title,
+        url=href,
+        article=text_obj.article,
+        common_words=text_obj.common_words,
+        entities=text_obj.entities,
+        count_words=text_obj.count_words,
+        length=text_obj.length,
+        sentiments=ai_obj.sentiments,
+        ideologies=ai_obj.ideologies,
+    )
+    return ArticleWithWords(
+        article=db_article, frequency_words=text_obj.frequency_words, pos_tags=text_obj.pos_tags
+    )
+
+
+async def store_article(
+    media_id: int, title: str, href: str, text_obj: ArticleText, ai_obj: ArticleAi
+) -> None:
+    """
+    Stores an analyzed article with its words and facts.
+    Args:
+        media_id (int): The ID of the media source.
+        title (str): The title of the article.
+        href (str): The URL of the article.
+        text_obj (ArticleText): The text analysis result.
+        ai_obj (ArticleAi): The AI analysis result.
+    Returns:
+        None
+    """
+    item = build_article(media_id, title, href, text_obj, ai_obj)
+    await create_article_with_words_and_facts(item.article, item.frequency_words, item.pos_tags)
+
+
+async def enqueue_ai_analysis(
+    media_id: int, title: str, href: str, article: str, cache_key: str, text_obj: ArticleText
+) -> None:
+    """
+    Queues an NLP-analyzed article for the AI analysis.
+    Args:
+        media_id (int): The ID of the media source.
+        title (str): The title of the article.
+        href (str): The URL of the article.
+        article (str): The raw article text to classify.
+        cache_key (str): The analysis cache key of the article.
+        text_obj (ArticleText): The text analysis result.
+    Returns:
+        None
+    """
+    await enqueue_ai_job(
+        media_id, title, href, article, cache_key, text_obj.model_dump(mode="json")
+    )
+    _queue_stats["enqueued"] += 1
+    logger.info(f"Article queued for AI analysis: {href}")
+
+
+async def _fail_job(job, error: Exception) -> None:
+    """Retry the job after an exponential delay, or dead-letter it after AI_QUEUE_MAX_ATTEMPTS."""
+    if job.attempts >= AI_QUEUE_MAX_ATTEMPTS:
+        _queue_stats["dead_lettered"] += 1
+        logger.error(f"AI analysis job {job.id} dead-lettered after {job.attempts} attempts: {error}")
+        await fail_ai_job(job.id, repr(error), retry_delay=None)
+        return
+    retry_delay = AI_QUEUE_RETRY_DELAY * 2 ** (job.attempts - 1)
+    _queue_stats["retried"] += 1
+    logger.warning(f"AI analysis job {job.id} attempt {job.attempts} failed, retrying in {retry_delay}s: {error}")
+    await fail_ai_job(job.id, repr(error), retry_delay=retry_delay)
+
+
+async def process_ai_queue_batch() -> int:
+    """
+    Claims a batch of due jobs, classifies them in one Back-ai request and stores the articles.
+    Returns:
+        int: The number of processed jobs, 0 if none was due.
+    """
+    jobs = await claim_ai_jobs(AI_QUEUE_BATCH_SIZE)
+    if not jobs:
+        return 0
+
+    try:
+        analyzers = [await AiAnalyzer.create(job.article) for job in jobs]
+        # Retried jobs jump ahead of the fresh articles waiting for the provider quota
+        priority = "high" if any(job.attempts > 1 for job in jobs) else "normal"
+        analyses = await AiAnalyzer.extract_analysis_batch(analyzers, priority)
+    except Exception as e:
+        for job in jobs:
+            await _fail_job(job, e)
+        return len(jobs)
+
+    analyzed = []
+    for job, analysis in zip(jobs, analyses):
+        try:
+            ai_obj = validate_ai_analysis(analysis)
+            await cache_analysis(job.cache_key, ai_obj=ai_obj)
+            text_obj = ArticleText.model_validate(job.text_analysis)
+            analyzed.append((job, build_article(job.media_id, job.title, job.url, text_obj, ai_obj)))
+        except Exception as e:
+            await _fail_job(job, e)
+    if analyzed:
+        await store_batch(analyzed)
+    return len(jobs)
+
+
+async def store_batch(analyzed: list[tuple]) -> None:
+    """
+    Stores the analyzed articles of a batch in one transaction and deletes their jobs.
+    If the batch fails, the articles are stored one by one so only the failing ones are retried.
+    Args:
+        analyzed (list[tuple]): The jobs with their ArticleWithWords.
+    """
+    try:
+        skipped = set(await create_articles_with_words_and_facts([item for _, item in analyzed]))
+    except Exception as e:
+        logger.warning(f"Batch of {len(analyzed)} articles failed, storing them one by one: {e}")
+        for job, item in analyzed:
+            try:
+                await create_article_with_words_and_facts(item.article, item.frequency_words, item.pos_tags)
+                await delete_ai_jobs([job.id])
+                _queue_stats["stored"] += 1
+            except Exception as e:
+                await _fail_job(job, e)
+        return
+
+    # Duplicate URLs are already stored, their jobs are done too
+    await delete_ai_jobs([job.id for job, _ in analyzed])
+    for job, item in analyzed:
+        if str(item.article.url) in skipped:
+            _queue_stats["duplicates"] += 1
+            logger.info(f"Article already stored, skipped: {job.url}")
+        else:
+            _queue_stats["stored"] += 1
+            logger.info(f"Article stored after AI analysis: {job.url}")
+
+
+async def run_ai_queue_consumer() -> None:
+    """
+    Consumes the AI analysis queue until cancelled, polling every AI_QUEUE_POLL_INTERVAL when idle.
+    Jobs left as PROCESSING by a previous run are requeued first.
+    """
+    try:
+        requeued = await requeue_processing_ai_jobs()
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted AI analysis jobs")
+    except Exception as e:
+        logger.exception(f"Error requeuing interrupted AI analysis jobs: {e}")
+
+    while True:
+        try:
+            processed = await process_ai_queue_batch()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Error in AI analysis queue consumer: {e}")
+            processed = 0
+        if not processed:
+            await asyncio.sleep(AI_QUEUE_POLL_INTERVAL)
+
+
+async def drain_ai_queue(timeout: float = AI_QUEUE_DRAIN_TIMEOUT) -> None:
+    """
+    Waits until no job is due or processing, helping the consumer, or until the timeout.
+    Jobs waiting for a retry are left to the background consumer.
+    Args:
+        timeout (float): Maximum seconds to wait.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not await count_due_ai_jobs():
+            return
+        if not await process_ai_queue_batch():
+            await asyncio.sleep(AI_QUEUE_POLL_INTERVAL)
+    logger.warning(f"AI analysis queue not drained after {timeout}s")
+
+
+async def get_ai_queue_stats() -> dict:
+    """
+    Get the AI analysis queue statistics since the service started and the current jobs by status.
+    Returns:
+        dict: Enqueued, stored, duplicate, retried and dead-lettered counts, and the jobs by status.
+    """
+    return {**_queue_stats, "jobs": await count_ai_jobs_by_status()}
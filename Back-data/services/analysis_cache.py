@@ -0,0 +1,124 @@
+"""
+Module for caching the text and AI analysis of articles in the database.
+Entries are keyed by a hash of the cleaned article text, so re-processed articles and
+syndicated copies published under several URLs skip the NLP and LLM calls.
+"""
+
+import hashlib
+import logging
+import os
+from models.py_schemas import ArticleAi, ArticleText
+from repository.repository_services import (
+    get_analysis_cache,
+    upsert_analysis_cache,
+    evict_analysis_cache,
+)
+from utils.text_utils import clean_text
+
+logger = logging.getLogger(__name__)
+
+
+# Maximum number of entries kept, the least recently used ones are evicted after each daily job
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+
+# Cache statistics
+_cache_stats = {
+    "hits": 0,
+    "text_hits": 0,
+    "ai_hits": 0,
+    "misses": 0,
+    "errors": 0,
+}
+
+
+def get_cache_key(article: str) -> str:
+    """
+    Generate the cache key of an article from its cleaned text.
+    Args:
+        article (str): The raw article text.
+    Returns:
+        str: The SHA-256 hex digest of the cleaned text.
+    """
+    return hashlib.sha256(clean_text(article).encode()).hexdigest()
+
+
+async def get_cached_analysis(key: str, article: str) -> tuple[ArticleText | None, ArticleAi | None]:
+    """
+    Retrieve the cached analysis of an article.
+    Args:
+        key (str): The cache key of the article.
+        article (str): The raw article text, used to refresh its raw length and word count.
+    Returns:
+        tuple[ArticleText | None, ArticleAi | None]: The cached results, None for the missing ones.
+    """
+    try:
+        entry = await get_analysis_cache(key)
+    except Exception as e:
+        _cache_stats["errors"] += 1
+        logger.warning(f"Analysis cache lookup failed: {e}")
+        return None, None
+
+    if entry is None:
+        _cache_stats["misses"] += 1
+        return None, None
+
+    _cache_stats["hits"] += 1
+    text_obj = None
+    ai_obj = None
+    if entry.text_analysis:
+        _cache_stats["text_hits"] += 1
+        # Raw length and word count may differ between copies with the same cleaned text
+        text_obj = ArticleText.model_validate(entry.text_analysis).model_copy(
+            update={"length": len(article), "count_words": len(article.split())}
+        )
+    if entry.ai_analysis:
+        _cache_stats["ai_hits"] += 1
+        ai_obj = ArticleAi.model_validate(entry.ai_analysis)
+    logger.info(f"Analysis cache HIT: {key[:12]} (text: {text_obj is not None}, ai: {ai_obj is not None})")
+    return text_obj, ai_obj
+
+
+async def cache_analysis(
+    key: str,
+    text_obj: ArticleText | None = None,
+    ai_obj: ArticleAi | None = None,
+) -> None:
+    """
+    Store the analysis results of an article, errors are logged and never raised.
+    Args:
+        key (str): The cache key of the article.
+        text_obj (ArticleText | None): The text analysis result.
+        ai_obj (ArticleAi | None): The AI analysis result.
+    """
+    try:
+        await upsert_analysis_cache(
+            key,
+            text_analysis=text_obj.model_dump(mode="json") if text_obj else None,
+            ai_analysis=ai_obj.model_dump(mode="json") if ai_obj else None,
+        )
+    except Exception as e:
+        _cache_stats["errors"] += 1
+        logger.warning(f"Analysis cache store failed: {e}")
+
+
+async def evict_cache() -> int:
+    """
+    Evict the least recently used entries above ANALYSIS_CACHE_MAX_ENTRIES.
+    Returns:
+        int: The number of evicted entries.
+    """
+    evicted = await evict_analysis_cache(ANALYSIS_CACHE_MAX_ENTRIES)
+    logger.info(f"Analysis cache evicted {evicted} entries")
+    return evicted
+
+
+def get_cache_stats() -> dict:
+    """
+    Get the analysis cache statistics since the service started.
+    Returns:
+        dict: Hits (also by analysis type), misses, errors and hit rate.
+    """
+    stats = dict(_cache_stats)
+    total = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / total * 100, 2) if total else 0.0
+    return stats
@@ -2,13 +2,13 @@
 This module contains the main service for web scraping using Playwright.
 """
 
-import asyncio
 import logging
 import aiohttp
 from playwright.async_api import async_playwright, BrowserContext
 from repository.repository_services import (
     get_media_id_url, 
     check_article_exists,
+    refresh_word_counts,
     get_media_id_url_by_id, # For testing purposes
     update_media_active
 )
@@ -18,8 +18,12 @@ from services.scrapper import (
     get_article_from_script_tag,
 )
 from services.x_upload import upload_to_x
+from repository.word_cache import WORD_CACHE
+from services.analysis_cache import evict_cache, get_cache_stats
+from services.ai_queue import drain_ai_queue, get_ai_queue_stats
 from media_sources.medias_map_scrapper import MEDIAS_MAPPING, MediaMap
 from utils.utils import check_href, clean_href
+from utils.http_client import request_json
 
 
 logger = logging.getLogger(__name__)
@@ -44,18 +48,8 @@ async def invalidate_api_cache():
     
     try:
         logger.info("Triggering API cache invalidation...")
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                cache_url,
-                timeout=aiohttp.ClientTimeout(total=120)
-            ) as response:
-                if response.status != 200:
-                    logger.warning(f"Cache invalidation returned status {response.status}")
-        
-        # Allow aiohttp to clean up background tasks
-        await asyncio.sleep(10)
-                    
+        await request_json("back-api", "POST", cache_url)
+
     except aiohttp.ClientError as e:
         logger.error(f"Failed to invalidate cache (network error): {e}")
     except Exception as e:
@@ -238,7 +232,21 @@ async def main_service_main():
 
             await browser.close()
             
+            # Wait for the queued articles to be classified and stored
+            await drain_ai_queue()
+
+            # Ingestion only appends facts, the word counts shown by the API are refreshed here
+            try:
+                refreshed = await refresh_word_counts()
+                logger.info("Word counts refreshed: %d words updated", refreshed)
+            except Exception as e:
+                logger.error("Failed to refresh the word counts: %s", e)
+
             logger.info("Daily job from main_service.main() completed successfully.")
+            logger.info("Analysis cache stats: %s", get_cache_stats())
+            logger.info("AI analysis queue stats: %s", await get_ai_queue_stats())
+            logger.info("Word ID cache stats: %s", WORD_CACHE.stats())
+            await evict_cache()
             
             # Invalidate and refresh API cache after scraping
             await invalidate_api_cache()
@@ -0,0 +1,31 @@
+"""
+Client for the standalone NLP service (Back-nlp).
+Used instead of the in-process TextAnalyzer when NLP_SERVICE_URL is set.
+"""
+
+import os
+from models.py_schemas import ArticleText
+from utils.http_client import request_json
+
+API_VERSION = "v1"
+
+# e.g. http://back-nlp:7000 (Docker service name), empty to analyze in-process
+NLP_SERVICE_URL = os.getenv("NLP_SERVICE_URL", "")
+
+HEADERS = {
+    "Content-Type": "application/json"
+}
+
+async def analyze_texts(texts: list[str]) -> list[ArticleText]:
+    """
+    Analyze a batch of articles with the NLP service.
+    Args:
+        texts (list[str]): The raw article texts.
+    Returns:
+        list[ArticleText]: The analysis of each article, in the same order.
+    Raises:
+        aiohttp.ClientError: If the request fails.
+    """
+    url = f"{NLP_SERVICE_URL}/nlp/{API_VERSION}/analyze/batch"
+    response_data = await request_json("back-nlp", "POST", url, headers=HEADERS, json={"texts": texts})
+    return [ArticleText.model_validate(item) for item in response_data["response"]]
@@ -7,10 +7,11 @@ import json
 import logging
 from typing import Final
 from bs4 import BeautifulSoup, Comment
-from services.ai_analyzer import AiAnalyzer
-from models.py_schemas import ArticleAi, ArticleText, ArticleCreate
-from repository.repository_services import create_article_with_words_and_facts
+from services.ai_queue import enqueue_ai_analysis, store_article
+from services.analysis_cache import get_cache_key, get_cached_analysis, cache_analysis
+from models.py_schemas import ArticleText
 from services.text_analyzer import TextAnalyzer
+from services.nlp_client import NLP_SERVICE_URL, analyze_texts
 from utils.utils import process_tag_texts, UNWRAP_TAGS, REMOVE_TAGS
 from media_sources.medias_map_scrapper import LocateTags
 
@@ -173,13 +174,18 @@ def assemble_article(texts: list) -> str:
 
 async def invoke_text_analyzer(article: str) -> ArticleText:
     """
-    Analyzes the given article text using the TextAnalyzer class.
+    Analyzes the given article text using the TextAnalyzer class, or the NLP service if configured.
     Args:
         article (str): The article text to be analyzed.
     Returns:
         ArticleText: An object containing the analyzed text data.
     """
     logging.info(f"+++++++++\n{article}\n+++++++++")
+    if NLP_SERVICE_URL:
+        analyzer_text_obj = (await analyze_texts([article]))[0]
+        logging.info(f"Most Common Words: {analyzer_text_obj.common_words}")
+        return analyzer_text_obj
+
     text_analyzer = TextAnalyzer(article)
 
     article_length = len(article)
@@ -209,35 +215,13 @@ async def invoke_text_analyzer(article: str) -> ArticleText:
     )
 
 
-async def invoke_ai_analizer(article: str) -> ArticleAi:
-    """
-    Analyzes the given article text using the AiAnalyzer class.
-    Args:
-        article (str): The article text to be analyzed.
-    Returns:
-        ArticleAi: An object containing the analyzed AI data.
-    """
-    print("--------")
-    ai_analyzer = AiAnalyzer(article)
-
-    ideologies = await ai_analyzer.extract_ideology()
-    logging.info(f"Extract ideology: {ideologies}")
-    if not ideologies or len(ideologies) < 3:
-        raise Exception("Ideology extraction failed.")
-
-    sentiments = await ai_analyzer.extract_sentiment()
-    logging.info(f"Extract main sentiment: {sentiments}")
-    if not sentiments or len(sentiments) < 3:
-        raise Exception("Sentiment extraction failed.")
-
-    return ArticleAi(sentiments=sentiments, ideologies=ideologies)
-
-
 async def create_article_to_db(
     media_id: int, title: str, href: str, article: str
 ) -> None:
     """
-    Asynchronously creates an article record in the database after analyzing the text and invoking AI analysis.
+    Asynchronously analyzes the text of an article and stores it in the database.
+    Analysis results already cached for the same cleaned text are reused, articles without
+    a cached AI analysis are queued for the AI analysis consumer instead of waiting on it.
     Args:
         media_id (int): The ID of the media source.
         title (str): The title of the article.
@@ -246,24 +230,17 @@ async def create_article_to_db(
     Returns:
         None
     """
-    analyzer_text_obj = await invoke_text_analyzer(article)
-    analyzer_ai_obj = await invoke_ai_analizer(article)
-
-    db_article = ArticleCreate(
-        media_id=media_id,
-        title=title,
-        url=href,
-        article=analyzer_text_obj.article,
-        common_words=analyzer_text_obj.common_words,
-        entities=analyzer_text_obj.entities,
-        count_words=analyzer_text_obj.count_words,
-        length=analyzer_text_obj.length,
-        sentiments=analyzer_ai_obj.sentiments,
-        ideologies=analyzer_ai_obj.ideologies,
-    )
-    await create_article_with_words_and_facts(
-        db_article, analyzer_text_obj.frequency_words, analyzer_text_obj.pos_tags
-    )
+    cache_key = get_cache_key(article)
+    analyzer_text_obj, analyzer_ai_obj = await get_cached_analysis(cache_key, article)
+
+    if analyzer_text_obj is None:
+        analyzer_text_obj = await invoke_text_analyzer(article)
+        await cache_analysis(cache_key, text_obj=analyzer_text_obj)
+    if analyzer_ai_obj is None:
+        await enqueue_ai_analysis(media_id, title, href, article, cache_key, analyzer_text_obj)
+        return
+
+    await store_article(media_id, title, href, analyzer_text_obj, analyzer_ai_obj)
 
 
 async def get_article_with_tags(
@@ -0,0 +1,181 @@
+"""
+Module for summarizing articles longer than the LLM input budget (TEXT_SIZE).
+The strategy is selected with the SUMMARIZER environment variable:
+- "bart": abstractive summaries with facebook/bart-large-cnn on CPU (default).
+- "extractive": TF-IDF sentence scoring keeping the best sentences, in milliseconds.
+"""
+
+import asyncio
+import math
+import os
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from transformers import BartTokenizer, pipeline
+from utils.text_utils import clean_text
+
+
+TEXT_SIZE = 19000  # Maximum length of the texts sent to the LLM
+
+CHUNK_SIZE = 1000  # Adjust to model's max token limit
+OVERLAP = 100  # Overlap ensures context continuity
+
+SUMMARIZER = os.getenv("SUMMARIZER", "bart").lower()
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "4"))  # Chunks summarized together
+SUMMARIZER_QUANTIZE = os.getenv("SUMMARIZER_QUANTIZE", "false").lower() == "true"
+
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Single worker thread: summaries run one at a time off the event loop
+_summarizer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarizer")
+
+
+def chunk_text(text, tokenizer: BartTokenizer, chunk_size, overlap) -> list[str]:
+    tokens = tokenizer(text, return_tensors="pt", truncation=False)["input_ids"][0]
+    # Ensure all token IDs are within the valid range, in one tensor op
+    tokens = tokens.clamp(max=tokenizer.vocab_size - 1)
+
+    # Overlapping windows as tensor views, decoded together
+    windows = [tokens[i:i + chunk_size] for i in range(0, len(tokens), chunk_size - overlap)]
+    return tokenizer.batch_decode(windows)
+
+
+def load_summarizer(model_name: str, tokenizer: BartTokenizer, quantize: bool = False):
+    """
+    Loads the summarization pipeline on CPU.
+    Args:
+        model_name (str): The Hugging Face model name.
+        tokenizer (BartTokenizer): The tokenizer to reuse.
+        quantize (bool): Apply dynamic int8 quantization to the Linear layers.
+    Returns:
+        The summarization pipeline.
+    """
+    summarizer = pipeline(
+        "summarization",
+        model=model_name,
+        tokenizer=tokenizer, # Reuse tokenizer
+        device="cpu",
+        framework="pt", # Explicitly use PyTorch
+        batch_size=SUMMARY_BATCH_SIZE,
+    )
+    if quantize:
+        import torch
+        summarizer.model = torch.quantization.quantize_dynamic(
+            summarizer.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return summarizer
+
+
+class Summarizer(ABC):
+    """Base summarization strategy, the strategies implement summarize."""
+
+    def load(self) -> None:
+        """Load the resources of the strategy, if any."""
+
+    def warm_up(self, text: str) -> None:
+        """Load and exercise the strategy over a sample text before the first article."""
+        self.load()
+
+    @abstractmethod
+    def summarize(self, text: str) -> str:
+        """Summarize the text, blocking: called in the summarizer thread."""
+
+    async def summarize_async(self, text: str) -> str:
+        """Summarize the text in the summarizer thread without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_summarizer_executor, self.summarize, text)
+
+
+class BartSummarizer(Summarizer):
+    """Abstractive summary of the overlapping token chunks of the text with BART."""
+
+    model_name = "facebook/bart-large-cnn"
+
+    def __init__(self, quantize: bool = SUMMARIZER_QUANTIZE):
+        self.quantize = quantize
+        self.tokenizer = None
+        self.pipeline = None
+
+    def load(self) -> None:
+        if self.tokenizer is None or self.pipeline is None:
+            # Initialize both models in one go to reduce overhead
+            self.tokenizer = BartTokenizer.from_pretrained(
+                self.model_name,
+                use_fast=True # Use faster tokenizer implementation
+            )
+            self.pipeline = load_summarizer(self.model_name, self.tokenizer, self.quantize)
+
+    def warm_up(self, text: str) -> None:
+        self.load()
+        self.pipeline(text, max_length=20, min_length=5)
+
+    def summarize(self, text: str) -> str:
+        self.load()
+        chunks = chunk_text(text, self.tokenizer, CHUNK_SIZE, OVERLAP)
+        # All the chunks of the article in one pipeline call
+        summaries = self.pipeline(chunks, batch_size=SUMMARY_BATCH_SIZE)
+        return " ".join(summary['summary_text'] for summary in summaries)
+
+
+class ExtractiveSummarizer(Summarizer):
+    """
+    Extractive summary keeping the sentences with the highest mean TF-IDF of their words,
+    in their original order, until the text fits in max_chars. The first sentence (the title)
+    is always kept.
+    """
+
+    def __init__(self, max_chars: int = TEXT_SIZE):
+        self.max_chars = max_chars
+
+    def summarize(self, text: str) -> str:
+        if len(text) <= self.max_chars:
+            return text
+
+        sentences = [sentence for sentence in SENTENCE_SPLIT_RE.split(text.strip()) if sentence]
+        sentence_words = [clean_text(sentence).split() for sentence in sentences]
+
+        # Term frequency over the text, inverse document frequency over the sentences
+        term_counts = Counter(word for words in sentence_words for word in words)
+        document_counts = Counter(word for words in sentence_words for word in set(words))
+        num_sentences = len(sentences)
+
+        def score(words: list[str]) -> float:
+            if not words:
+                return 0.0
+            return sum(
+                term_counts[word] * math.log(num_sentences / document_counts[word]) for word in words
+            ) / len(words)
+
+        ranking = sorted(range(1, num_sentences), key=lambda i: score(sentence_words[i]), reverse=True)
+
+        selected = {0}
+        size = len(sentences[0])
+        for i in ranking:
+            if size + len(sentences[i]) + 1 <= self.max_chars:
+                selected.add(i)
+                size += len(sentences[i]) + 1
+
+        return " ".join(sentences[i] for i in sorted(selected))[:self.max_chars]
+
+    async def summarize_async(self, text: str) -> str:
+        return self.summarize(text)  # Milliseconds, no need for the summarizer thread
+
+
+SUMMARIZERS = {
+    "bart": BartSummarizer,
+    "extractive": ExtractiveSummarizer,
+}
+
+
+def get_summarizer() -> Summarizer:
+    """
+    Singleton pattern to ensure only one summarizer, selected by SUMMARIZER, is loaded.
+    Returns:
+        Summarizer: The configured summarization strategy.
+    """
+    if not hasattr(get_summarizer, "summarizer"):
+        if SUMMARIZER not in SUMMARIZERS:
+            raise ValueError(f"Unknown SUMMARIZER '{SUMMARIZER}', expected one of {list(SUMMARIZERS)}")
+        get_summarizer.summarizer = SUMMARIZERS[SUMMARIZER]()
+    return get_summarizer.summarizer
@@ -1,5 +1,6 @@
 """
 Module for text analysis using SpaCy and asyncio.
+The NLP service (Back-nlp) mounts this module, so both services analyze texts the same way.
 """
 
 import asyncio
@@ -8,7 +9,7 @@ import spacy
 from spacy.tokenizer import Tokenizer
 from spacy.util import compile_infix_regex
 from spacy.lang.char_classes import LIST_ELLIPSES, LIST_ICONS
-from utils.utils import clean_text
+from utils.text_utils import clean_text
 
 def get_nlp():
     """
@@ -67,6 +68,7 @@ class TextAnalyzer:
         self.chunk_size = chunk_size
         self.cleaned_chunks = self._chunk_and_clean_text()
         self.nlp = get_nlp()
+        self._docs = {}
 
 
     def _chunk_and_clean_text(self) -> list[str]:
@@ -96,6 +98,16 @@ class TextAnalyzer:
         return chunks
 
 
+    def use_docs(self, docs: list) -> None:
+        """
+        Uses SpaCy docs already computed for the current cleaned chunks, e.g. by nlp.pipe over
+        the chunks of a batch of articles, instead of processing the chunks one by one.
+        Parameters:
+            docs (list[Doc]): The docs of the cleaned chunks, in the same order.
+        """
+        self._docs = dict(zip(self.cleaned_chunks, docs))
+
+
     async def _process_chunks(self, process_function) -> list:
         """
         Applies a processing function asynchronously to each chunk.
@@ -117,7 +129,8 @@ class TextAnalyzer:
         Returns:
             Doc: Processed SpaCy Doc object.
         """
-        return self.nlp(chunk)
+        doc = self._docs.get(chunk)
+        return doc if doc is not None else self.nlp(chunk)
 
 
     async def remove_stop_words(self) -> str:
@@ -131,6 +144,7 @@ class TextAnalyzer:
             return " ".join([token.text for token in doc if not token.is_stop])
 
         self.cleaned_chunks = await self._process_chunks(remove_stop_words_from_chunk)
+        self._docs = {}  # Docs of the chunks before the stop words removal
         return " ".join(self.cleaned_chunks).strip()
 
 
@@ -204,20 +218,33 @@ class TextAnalyzer:
 
     async def get_pos_tags(self) -> dict[str, str]:
         """
-        Returns part-of-speech tags for tokens across all chunks asynchronously.
+        Returns the majority part-of-speech tag of each word kept after stop-word removal.
+        Only (word, POS) counts of the words in the cleaned chunks are kept, so the tag stored
+        for a word does not depend on its last occurrence in the article.
         Returns:
-            dict[str, str]: A dictionary of token texts and their POS tags.
+            dict[str, str]: A dictionary of words and their most frequent POS tags.
         """
 
-        async def extract_pos_tags_from_chunk(chunk: str):
+        async def count_pos_tags_from_chunk(chunk: str) -> Counter:
+            words = set(chunk.split())
             doc = await self._process_chunk_with_nlp(chunk)
-            return {token.text: token.pos_ for token in doc}
+            return Counter(
+                (token.text, token.pos_) for token in doc if token.text in words
+            )
 
-        pos_results = await self._process_chunks(extract_pos_tags_from_chunk)
+        pos_results = await self._process_chunks(count_pos_tags_from_chunk)
 
-        # Merge POS tags across chunks
-        pos_tags = {}
+        # Merge (word, POS) counts across chunks
+        pos_counts = Counter()
         for result in pos_results:
-            pos_tags.update(result)
+            pos_counts.update(result)
+
+        # Keep the most frequent tag per word, ties resolved by first occurrence
+        pos_tags = {}
+        tag_counts = {}
+        for (word, pos), count in pos_counts.items():
+            if count > tag_counts.get(word, 0):
+                tag_counts[word] = count
+                pos_tags[word] = pos
 
         return pos_tags
@@ -0,0 +1,86 @@
+"""
+Module for warming up the NLP and summarization models and the word ID cache before the daily job runs.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from services.text_analyzer import get_nlp
+from services.summarizer import get_summarizer
+from services.nlp_client import NLP_SERVICE_URL
+from repository.repository_services import warm_word_cache
+
+logger = logging.getLogger(__name__)
+
+
+# Set WARM_UP_MODELS=false to skip the models warm-up (e.g. while developing scrapers),
+# the word ID cache is warmed up anyway
+WARM_UP_MODELS = os.getenv("WARM_UP_MODELS", "true").lower() == "true"
+
+WARM_UP_TEXT = (
+    "The government announced on Monday a new economic policy to support small businesses "
+    "affected by the rise of energy prices, while the opposition criticised the measures."
+)
+
+
+def _warm_up_nlp() -> float:
+    """
+    Loads the SpaCy model and runs it once over a sample text.
+    Returns:
+        float: Elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    nlp = get_nlp()
+    nlp(WARM_UP_TEXT)
+    return time.perf_counter() - start
+
+
+def _warm_up_summarizer() -> float:
+    """
+    Loads the configured summarizer (BART tokenizer and pipeline by default) and runs it once.
+    Returns:
+        float: Elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    get_summarizer().warm_up(WARM_UP_TEXT)
+    return time.perf_counter() - start
+
+
+async def warm_up(models: bool = WARM_UP_MODELS) -> None:
+    """
+    Startup warm-up: the models unless WARM_UP_MODELS is false, then the word ID cache.
+    """
+    if models:
+        await warm_up_models()
+    await warm_up_word_cache()
+
+
+async def warm_up_models() -> None:
+    """
+    Loads and exercises the models in a worker thread so the event loop stays responsive.
+    Errors are logged and never raised: the models are then loaded lazily on first use.
+    """
+    warm_ups = [("Summarizer", _warm_up_summarizer)]
+    if not NLP_SERVICE_URL:  # The NLP model lives in the NLP service otherwise
+        warm_ups.insert(0, ("SpaCy NLP", _warm_up_nlp))
+
+    for name, warm_up_model in warm_ups:
+        try:
+            elapsed = await asyncio.to_thread(warm_up_model)
+            logger.info("🔥 %s model warmed up in %.2fs", name, elapsed)
+        except Exception as e:
+            logger.exception("❌ Error warming up %s model: %s", name, e)
+
+
+async def warm_up_word_cache() -> None:
+    """
+    Loads the IDs of the most frequent words, so they skip the upsert of the ingestion path
+    from the first article. Errors are logged and never raised: the cache then fills on first use.
+    """
+    try:
+        start = time.perf_counter()
+        loaded = await warm_word_cache()
+        logger.info("🔥 Word ID cache warmed up with %d words in %.2fs", loaded, time.perf_counter() - start)
+    except Exception as e:
+        logger.exception("❌ Error warming up the word ID cache: %s", e)
@@ -13,6 +13,7 @@ import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend for server environments
 import matplotlib.pyplot as plt
 import tweepy
+from utils.http_client import request_json
 
 
 # Docker service configuration (uses Docker Compose service name)
@@ -62,23 +63,14 @@ async def make_request(endpoint: str) -> Optional[dict]:
     """
     url = BACK_API_BASE_URL + endpoint
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                # Log the full response for debugging
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"API error for {endpoint}: Status {response.status}")
-                    print(f"Response body: {error_text}")
-                
-                response.raise_for_status()
-                return await response.json()
-        except aiohttp.ClientError as e:
-            print(f"API request error for {endpoint}: {e}")
-            return None
-        except Exception as e:
-            print(f"Unexpected error requesting {endpoint}: {e}")
-            return None
+    try:
+        return await request_json("back-api", "GET", url, headers=HEADERS)
+    except aiohttp.ClientError as e:
+        print(f"API request error for {endpoint}: {e}")
+        return None
+    except Exception as e:
+        print(f"Unexpected error requesting {endpoint}: {e}")
+        return None
 
 
 def create_sentiment_bar_chart(sentiments_data: dict) -> io.BytesIO:
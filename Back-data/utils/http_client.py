@@ -0,0 +1,112 @@
+"""
+Shared HTTP client for the calls to the other services (back-ai, back-api, back-nlp).
+One aiohttp session with keep-alive connection pooling is created and closed in the FastAPI
+lifespan, each target has its own timeout and retry policy.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TargetPolicy:
+    """
+    Timeout and retry policy for a target service.
+    Attributes:
+        timeout (float): Total timeout of a request in seconds.
+        retries (int): Retries after a connection error or a 502/503/504 response.
+        backoff (float): Seconds to wait before the first retry, doubled on each retry.
+        idempotent (bool): Whether a request may run twice. Otherwise only the failures to
+            establish the connection are retried, never the timeouts or error responses.
+    """
+
+    timeout: float
+    retries: int = 2
+    backoff: float = 1.0
+    idempotent: bool = True
+
+
+TARGET_POLICIES = {
+    # Back-ai waits for the LLM provider quota, batches may take minutes. A timed out batch may
+    # still be running there, the durable AI queue retries it later instead of sending it again now
+    "back-ai": TargetPolicy(timeout=900, retries=1, backoff=5.0, idempotent=False),
+    "back-api": TargetPolicy(timeout=120),
+    "back-nlp": TargetPolicy(timeout=300, retries=1),
+}
+
+RETRY_STATUSES = (502, 503, 504)
+
+_session: aiohttp.ClientSession | None = None
+
+
+async def init_http_client() -> None:
+    """Create the shared session, called at the service startup."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=50,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+        logger.info("HTTP client session created")
+
+
+async def close_http_client() -> None:
+    """Close the shared session and its connections, called at the service shutdown."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("HTTP client session closed")
+    _session = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Get the shared session, created on first use outside of the FastAPI lifespan (e.g. scripts)."""
+    if _session is None or _session.closed:
+        await init_http_client()
+    return _session
+
+
+async def request_json(target: str, method: str, url: str, **kwargs) -> Any:
+    """
+    Make a request to a target service and return the JSON response.
+    Args:
+        target (str): The target service name, a key of TARGET_POLICIES.
+        method (str): The HTTP method.
+        url (str): The full request URL.
+        **kwargs: Extra arguments for aiohttp (json, headers, params...).
+    Returns:
+        Any: The decoded JSON response.
+    Raises:
+        aiohttp.ClientError: If the request still fails after the retries.
+        asyncio.TimeoutError: If the last attempt times out.
+    """
+    policy = TARGET_POLICIES[target]
+    session = await get_http_session()
+    timeout = aiohttp.ClientTimeout(total=policy.timeout)
+
+    for attempt in range(policy.retries + 1):
+        try:
+            async with session.request(method, url, timeout=timeout, **kwargs) as response:
+                if response.status >= 400:
+                    error_text = await response.text()
+                    logger.warning(f"{target} {method} {url} returned {response.status}: {error_text[:300]}")
+                    if response.status in RETRY_STATUSES and policy.idempotent and attempt < policy.retries:
+                        raise aiohttp.ServerConnectionError(f"Status {response.status}")
+                response.raise_for_status()
+                return await response.json()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            # The request never reached the target only when the connection could not be established
+            retryable = policy.idempotent or isinstance(e, aiohttp.ClientConnectorError)
+            if not retryable or attempt >= policy.retries:
+                raise
+            wait_time = policy.backoff * 2 ** attempt
+            logger.warning(f"{target} request attempt {attempt + 1} failed ({e!r}), retrying in {wait_time}s")
+            await asyncio.sleep(wait_time)
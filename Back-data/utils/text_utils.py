@@ -0,0 +1,22 @@
+"""
+This module contains utility functions for text cleaning.
+It has no dependency on the scraping code, so the NLP service mounts it (docker-compose.yaml).
+"""
+
+import re
+
+
+# Words kept by clean_text: runs of two or more letters (no digits nor "_"), optionally joined
+# by hyphens placed between word characters, e.g. "trade-war". Everything else is dropped.
+CLEAN_TEXT_RE = re.compile(r"(?:[^\W_0-9]{2,}|(?<=[^\W0-9])-(?=[^\W0-9]))+")
+
+
+def clean_text(text: str) -> str:
+    """
+    Cleans the text from numbers, special characters, single characters and unnecessary spaces.
+    Parameters:
+        text (str): The text to clean.
+    Returns:
+        str: The cleaned text.
+    """
+    return " ".join(CLEAN_TEXT_RE.findall(text.lower()))
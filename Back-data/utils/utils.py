@@ -126,19 +126,5 @@ def check_href(href: str, media: MediaMap) -> bool:
     return any(word in href for word in media.target_hrefs) or href.endswith(".html")
 
 
-def clean_text(text: str) -> str:
-    """
-    Cleans the text from numbers, special characters, and unnecessary spaces.
-    Parameters:
-        text (str): The text to clean.
-    Returns:
-        str: The cleaned text.
-    """
-    cleaned_text = re.sub(r"[0-9]", " ", text.lower())
-    cleaned_text = re.sub(r"(?:_|[^\s\w])(?!(?<=\w\-)\w)", " ", cleaned_text)
-    cleaned_text = re.sub(r"\b\w\b", " ", cleaned_text)
-    return re.sub(r"\s+", " ", cleaned_text).strip()
-
-
 def clean_href(url_media: str, href: str) -> str:
     return urljoin(url_media, href)
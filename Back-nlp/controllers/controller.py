@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from services.nlp_core import analyze_batch
+from models.py_models import (
+    TextRequest, TextBatchRequest,
+    ResponseNLP, ResponseBatchNLP
+)
+
+API_VERSION = "v1"
+NLP_ROUTER = APIRouter(prefix=f"/nlp/{API_VERSION}", tags=["NLP Requests"])
+
+
+# Sync endpoints: FastAPI runs them in its threadpool so the CPU-bound analysis never blocks the event loop
+@NLP_ROUTER.post("/analyze", response_model=ResponseNLP)
+def analyze(request: TextRequest):
+    return analyze_batch([request.text])[0]
+
+
+@NLP_ROUTER.post("/analyze/batch", response_model=ResponseBatchNLP)
+def analyze_texts(request: TextBatchRequest):
+    return ResponseBatchNLP(response=analyze_batch(request.texts))
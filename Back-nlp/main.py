@@ -0,0 +1,28 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from controllers.controller import NLP_ROUTER
+from services.text_analyzer import get_nlp
+
+
+# Define lifespan to manage startup and shutdown events
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    print("Starting NLP service")
+    await run_in_threadpool(get_nlp)  # Load the NLP model before accepting requests
+    yield
+    # Shutdown
+    print("Shutting down NLP service")
+
+
+# Create the FastAPI app with the lifespan context manager.
+app = FastAPI(
+    lifespan=lifespan,
+    title="Medianalytics NLP",
+    version="1.0.0"
+)
+
+
+# Include the router from the controller
+app.include_router(NLP_ROUTER)
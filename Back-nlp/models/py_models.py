@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+
+
+MAX_BATCH_SIZE = 64
+
+
+class TextRequest(BaseModel):
+    text: str
+
+
+class TextBatchRequest(BaseModel):
+    texts: list[str] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class ResponseNLP(BaseModel):
+    article: str
+    common_words: dict[str, int]
+    entities: dict[str, dict]
+    count_words: int
+    length: int
+    frequency_words: dict[str, int]
+    pos_tags: dict[str, str]
+
+
+class ResponseBatchNLP(BaseModel):
+    response: list[ResponseNLP]
@@ -0,0 +1,65 @@
+"""
+Module for analyzing batches of articles with SpaCy.
+All the chunks of a batch are processed together with nlp.pipe, then the TextAnalyzer methods
+run over these docs, giving the same results as running TextAnalyzer over each article.
+"""
+
+import asyncio
+import os
+import threading
+from services.text_analyzer import TextAnalyzer, get_nlp
+from models.py_models import ResponseNLP
+
+
+# Number of chunks processed together by the NLP pipeline
+PIPE_BATCH_SIZE = int(os.getenv("NLP_PIPE_BATCH_SIZE", "32"))
+
+# The model is shared by the threadpool of a worker, scale with more workers instead
+_nlp_lock = threading.Lock()
+
+
+def analyze_batch(texts: list[str]) -> list[ResponseNLP]:
+    """
+    Analyze a batch of articles: stop words removal, word frequencies, POS tags and entities.
+    Args:
+        texts (list[str]): The raw article texts.
+    Returns:
+        list[ResponseNLP]: The analysis of each article, in the same order.
+    """
+    with _nlp_lock:
+        # Called from the FastAPI threadpool, no event loop runs in this thread
+        return asyncio.run(_analyze_batch(texts))
+
+
+def _pipe_docs(analyzers: list[TextAnalyzer]) -> None:
+    """Process the current cleaned chunks of all the analyzers with one nlp.pipe call."""
+    all_chunks = [chunk for analyzer in analyzers for chunk in analyzer.cleaned_chunks]
+    docs = iter(get_nlp().pipe(all_chunks, batch_size=PIPE_BATCH_SIZE))
+    for analyzer in analyzers:
+        analyzer.use_docs([next(docs) for _ in analyzer.cleaned_chunks])
+
+
+async def _analyze_batch(texts: list[str]) -> list[ResponseNLP]:
+    analyzers = [TextAnalyzer(text) for text in texts]
+
+    # First pass: remove stop words from every chunk of the batch
+    _pipe_docs(analyzers)
+    cleaned_articles = [await analyzer.remove_stop_words() for analyzer in analyzers]
+
+    # Second pass: POS tags and entities over the stop-word-free chunks
+    _pipe_docs(analyzers)
+
+    results = []
+    for text, analyzer, cleaned_article in zip(texts, analyzers, cleaned_articles):
+        results.append(
+            ResponseNLP(
+                article=cleaned_article,
+                common_words=await analyzer.most_common_words(),
+                entities=await analyzer.get_entities(),
+                count_words=len(text.split()),
+                length=len(text),
+                frequency_words=await analyzer.frequency_all_words(),
+                pos_tags=await analyzer.get_pos_tags(),
+            )
+        )
+    return results
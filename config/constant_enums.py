@@ -16,6 +16,17 @@ class MediaTypeEnum(str, Enum):
     COMPANY = "COMPANY"
 
 
+class AiJobStatusEnum(str, Enum):
+    """
+    AiJobStatusEnum is an enumeration that represents the states of a job of the AI analysis queue.
+    Completed jobs are deleted once their article is stored.
+    """
+
+    PENDING = "PENDING"
+    PROCESSING = "PROCESSING"
+    DEAD = "DEAD"
+
+
 class RegionsEnum(str, Enum):
     """
     RegionsEnum is an enumeration that represents different regions of the world.
@@ -2,9 +2,10 @@
 This module defines the database models for the web scraping project.
 """
 
-from datetime import date
+from datetime import date, datetime
 from sqlalchemy import (
     Boolean,
+    DateTime,
     Enum as SQLAlchemyEnum,
     Integer,
     PrimaryKeyConstraint,
@@ -21,6 +22,7 @@ from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from config.constant_enums import (
+    AiJobStatusEnum,
     MediaTypeEnum,
     RegionsEnum,
     CountriesEnum
@@ -143,4 +145,50 @@ class Facts(Base):
     id_article: Mapped[int] = mapped_column(ForeignKey("article.id"), index=True)
     id_word: Mapped[int] = mapped_column(ForeignKey("word.id"), index=True)
     frequency: Mapped[int] = mapped_column(SmallInteger)
-    __table_args__ = (PrimaryKeyConstraint("id_article", "id_word"),)
\ No newline at end of file
+    __table_args__ = (PrimaryKeyConstraint("id_article", "id_word"),)
+
+
+class AnalysisCache(Base):
+    """
+    Database model for the analysis cache of the data service.
+    Results are keyed by a hash of the cleaned article text so repeated content skips the analysis.
+    """
+
+    __tablename__ = "analysis_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    text_analysis: Mapped[dict] = mapped_column(JSONB, nullable=True, default=None)
+    ai_analysis: Mapped[dict] = mapped_column(JSONB, nullable=True, default=None)
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+    last_used: Mapped[datetime] = mapped_column(
+        DateTime, index=True, default=func.now()
+    )
+
+
+class AiAnalysisJob(Base):
+    """
+    Database model for the AI analysis queue of the data service.
+    Scraped and NLP-analyzed articles wait here for the AI classification, then are stored
+    as articles and their job deleted. Jobs failing too many times are kept as DEAD letters.
+    """
+
+    __tablename__ = "ai_analysis_queue"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    media_id: Mapped[SmallInteger] = mapped_column(ForeignKey("media.id"))
+    title: Mapped[str] = mapped_column(String(350))
+    url: Mapped[str] = mapped_column(String(600), unique=True)
+    article: Mapped[str] = mapped_column(Text)
+    cache_key: Mapped[str] = mapped_column(String(64))
+    text_analysis: Mapped[dict] = mapped_column(JSONB)
+    status: Mapped[str] = mapped_column(
+        SQLAlchemyEnum(AiJobStatusEnum), default=AiJobStatusEnum.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str] = mapped_column(Text, nullable=True, default=None)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+
+    __table_args__ = (
+        Index("ix_ai_analysis_queue_status_next_attempt", "status", "next_attempt_at"),
+    )